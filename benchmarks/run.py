@@ -0,0 +1,241 @@
+""" Benchmarks of the graph construction, its memory footprint and the search latency.
+
+Each case, this is, each term generator, size and distance, runs in a new process to measure its peak memory alone.
+The results are written in a JSON report, and two reports can be compared to check if a change is faster or slower.
+
+Usage:
+    python benchmarks/run.py --sizes 1000 10000 100000 --output report.json
+    python benchmarks/run.py --compare old_report.json new_report.json
+"""
+import json
+import platform
+import subprocess
+import sys
+import tracemalloc
+from argparse import ArgumentParser
+from datetime import datetime, timezone
+from math import ceil
+from multiprocessing import get_context
+from os import path
+from random import Random
+from tempfile import TemporaryDirectory
+from time import perf_counter
+from typing import Any, Dict, List, Optional, Sequence
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+# Benchmark the code of this repository instead of an installed version
+ROOT = path.dirname(path.dirname(path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from grapheditdistance import TextGraph  # noqa: E402
+from grapheditdistance.distances import EditDistance, Levenshtein, WeightedLevenshtein  # noqa: E402
+from wordlists import GENERATORS, from_file, misspell  # noqa: E402
+
+# The metrics to compare between reports, where lower values are better
+METRICS = ['build_seconds', 'freeze_seconds', 'peak_rss_bytes', 'bytes_per_node', 'frozen_bytes_per_node',
+           'p50_ms', 'p99_ms']
+
+
+def create_distance(name: str) -> EditDistance:
+    """ Create one of the benchmarked distances.
+
+    :param name: "levenshtein" or "weighted".
+    :return: The distance.
+    """
+    if name == 'levenshtein':
+        return Levenshtein()
+    distance = WeightedLevenshtein()
+    distance.add_insert_cost(' ', 0.5)
+    distance.add_delete_cost(' ', 0.5)
+    distance.add_replace_cost('-', ' ', 0.2)
+    for fr, to in ['sz', 'zs', 'ck', 'kc', 'ie', 'ei', 'mn', 'nm']:
+        distance.add_replace_cost(fr, to, 0.5)
+    return distance
+
+
+def peak_rss() -> Optional[int]:
+    """
+    :return: The peak resident set size of this process in bytes, or None if it cannot be measured.
+    """
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == 'darwin' else peak * 1024
+
+
+def graph_bytes(terms: Sequence[str], distance: str) -> int:
+    """ Measure the memory of a mutable graph with its Python allocations. The construction is traced apart
+       from the timed one, because tracing the allocations slows it down.
+
+    :param terms: The terms to index.
+    :param distance: The name of the distance.
+    :return: The allocated bytes of the graph once the terms are indexed.
+    """
+    tracemalloc.start()
+    try:
+        baseline = tracemalloc.get_traced_memory()[0]
+        graph = TextGraph(distance=create_distance(distance))
+        graph.index(terms)
+        return tracemalloc.get_traced_memory()[0] - baseline
+    finally:
+        tracemalloc.stop()
+
+
+def percentile(values: Sequence[float], rate: float) -> float:
+    """ Calculate a percentile with the nearest-rank method.
+
+    :param values: The sorted values.
+    :param rate: The percentile, between 0 and 100.
+    :return: The value of that percentile.
+    """
+    return values[max(0, ceil(rate / 100 * len(values)) - 1)]
+
+
+def run_case(generator: str,
+             size: int,
+             distance: str,
+             thresholds: List[float],
+             nbests: List[int],
+             queries: int,
+             engine: str,
+             seed: int,
+             wordlist: str = None) -> Dict[str, Any]:
+    """ Build a graph and measure its construction, memory and search latency.
+
+    :param generator: The name of the term generator.
+    :param size: The number of terms.
+    :param distance: The name of the distance.
+    :param thresholds: The search thresholds.
+    :param nbests: The nbest values of the searches.
+    :param queries: The number of searched terms, which are misspelled indexed terms.
+    :param engine: The search engine.
+    :param seed: The random seed.
+    :param wordlist: The file of the "file" generator.
+    :return: A dictionary with the case parameters and its measures.
+    """
+    terms = (from_file(wordlist) if generator == 'file' else GENERATORS[generator])(size, seed)
+    allocated = graph_bytes(terms, distance)
+    graph = TextGraph(distance=create_distance(distance))
+    start = perf_counter()
+    graph.index(terms)
+    build_seconds, nodes = perf_counter() - start, len(graph.nodes)
+    start = perf_counter()
+    graph.freeze()
+    freeze_seconds = perf_counter() - start
+    with TemporaryDirectory() as tmp:
+        file = path.join(tmp, 'graph.bin')
+        graph.save(file)
+        frozen_bytes = path.getsize(file)
+    case = {'generator': generator, 'size': len(terms), 'distance': distance, 'engine': engine, 'nodes': nodes,
+            'build_seconds': build_seconds, 'freeze_seconds': freeze_seconds, 'peak_rss_bytes': peak_rss(),
+            'bytes_per_node': allocated / nodes,
+            'frozen_bytes_per_node': frozen_bytes / nodes, 'searches': []}
+    rnd = Random(seed)
+    sample = [misspell(rnd.choice(terms), rnd) for _ in range(queries)]
+    for threshold in thresholds:
+        for nbest in nbests:
+            latencies, results = [], 0
+            for query in sample:
+                start = perf_counter()
+                results += len(graph.search(query, threshold, nbest, engine=engine))
+                latencies.append((perf_counter() - start) * 1000)
+            latencies.sort()
+            case['searches'].append({'threshold': threshold, 'nbest': nbest, 'queries': len(sample),
+                                     'results': results, 'p50_ms': percentile(latencies, 50),
+                                     'p99_ms': percentile(latencies, 99), 'mean_ms': sum(latencies) / len(latencies)})
+    return case
+
+
+def metadata() -> Dict[str, Any]:
+    """
+    :return: A dictionary with the date, the machine and the code version of this run.
+    """
+    try:
+        commit = subprocess.run(['git', 'rev-parse', 'HEAD'], cwd=ROOT, capture_output=True, text=True,
+                                check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {'date': datetime.now(timezone.utc).isoformat(), 'commit': commit, 'python': platform.python_version(),
+            'implementation': platform.python_implementation(), 'platform': platform.platform(),
+            'processor': platform.processor(), 'machine': platform.machine()}
+
+
+def compare(old_file: str, new_file: str) -> None:
+    """ Print the ratio between the measures of the common cases of two reports.
+
+    :param old_file: The old report.
+    :param new_file: The new report.
+    """
+    with open(old_file) as file:
+        old = _measures(json.load(file))
+    with open(new_file) as file:
+        new = _measures(json.load(file))
+    print(f'{"case":<70} {"metric":<22} {"old":>12} {"new":>12} {"new/old":>8}')
+    for key in (key for key in old if key in new):
+        for metric in METRICS:
+            if old[key].get(metric) and new[key].get(metric) is not None:
+                ratio = new[key][metric] / old[key][metric]
+                print(f'{key:<70} {metric:<22} {old[key][metric]:>12.4g} {new[key][metric]:>12.4g} {ratio:>8.2f}')
+
+
+def _measures(report: Dict[str, Any]) -> Dict[str, Dict[str, float]]:
+    """ The measures of each case and search of a report.
+
+    :param report: The report.
+    :return: A dictionary with a description of each case or search, and its measures.
+    """
+    measures = {}
+    for case in report['results']:
+        key = f'{case["generator"]} size={case["size"]} {case["distance"]} {case["engine"]}'
+        measures[key] = case
+        for search in case['searches']:
+            measures[f'{key} threshold={search["threshold"]} nbest={search["nbest"]}'] = search
+    return dict(sorted(measures.items()))
+
+
+def main() -> None:
+    parser = ArgumentParser(description='Benchmark the graph construction, its memory and the search latency.')
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1000, 10000, 100000],
+                        help='The number of terms of each graph, for example, from 1000 to 1000000.')
+    parser.add_argument('--generators', nargs='+', default=['english', 'synthetic'],
+                        choices=[*GENERATORS, 'file'], help='The term generators.')
+    parser.add_argument('--wordlist', help='A file with a term per line for the "file" generator.')
+    parser.add_argument('--distances', nargs='+', default=['levenshtein', 'weighted'],
+                        choices=['levenshtein', 'weighted'], help='The edit distances.')
+    parser.add_argument('--thresholds', type=float, nargs='+', default=[0.9, 0.8], help='The search thresholds.')
+    parser.add_argument('--nbest', type=int, nargs='+', default=[1, 0], help='The nbest values of the searches.')
+    parser.add_argument('--queries', type=int, default=50, help='The number of searches of each configuration.')
+    parser.add_argument('--engine', default='best-first', choices=['best-first', 'rows', 'automaton'],
+                        help='The search engine.')
+    parser.add_argument('--seed', type=int, default=0, help='The random seed.')
+    parser.add_argument('--output', default='benchmark.json', help='The file of the JSON report.')
+    parser.add_argument('--compare', nargs=2, metavar=('OLD', 'NEW'), help='Compare two reports instead of running.')
+    args = parser.parse_args()
+    if args.compare:
+        compare(*args.compare)
+        return
+    report = {'metadata': metadata(), 'parameters': vars(args), 'results': []}
+    context = get_context('spawn')
+    for generator in args.generators:
+        for size in args.sizes:
+            for distance in args.distances:
+                # A new process for each case, to measure its peak memory alone
+                with context.Pool(1) as pool:
+                    case = pool.apply(run_case, (generator, size, distance, args.thresholds, args.nbest,
+                                                 args.queries, args.engine, args.seed, args.wordlist))
+                report['results'].append(case)
+                searches = ', '.join(f't={search["threshold"]} n={search["nbest"]}: {search["p50_ms"]:.2f}/'
+                                     f'{search["p99_ms"]:.2f} ms' for search in case['searches'])
+                print(f'{generator} {size} {distance}: {case["nodes"]} nodes, build {case["build_seconds"]:.2f} s, '
+                      f'{case["bytes_per_node"]:.1f} bytes/node, {case["frozen_bytes_per_node"]:.1f} frozen '
+                      f'bytes/node, p50/p99 {searches}', flush=True)
+                with open(args.output, 'w') as file:
+                    json.dump(report, file, indent=2)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,101 @@
+""" Generators of reproducible term lists for the benchmarks. """
+import random
+from typing import Callable, Dict, List
+
+ALPHABET = 'abcdefghijklmnopqrstuvwxyz'
+
+# A bundled list of English stems and affixes, which generates terms that share prefixes and suffixes
+# like real dictionaries do
+STEMS = [
+    'account', 'act', 'adapt', 'address', 'adjust', 'advance', 'advert', 'agree', 'align', 'allow', 'alter', 'amend',
+    'analys', 'answer', 'appear', 'apply', 'approv', 'argu', 'arrang', 'assess', 'assign', 'assist', 'attach',
+    'attend', 'author', 'balanc', 'bank', 'bill', 'block', 'book', 'borrow', 'brand', 'break', 'build', 'buy',
+    'calculat', 'cancel', 'capital', 'card', 'care', 'cash', 'catalog', 'certif', 'chang', 'charg', 'check', 'claim',
+    'class', 'clear', 'client', 'close', 'collect', 'combin', 'comment', 'commit', 'communicat', 'compar', 'complet',
+    'comput', 'condition', 'confirm', 'connect', 'consider', 'construct', 'consult', 'contain', 'content', 'contract',
+    'control', 'convert', 'copy', 'correct', 'cost', 'count', 'cover', 'creat', 'credit', 'custom', 'damag', 'deal',
+    'debt', 'decid', 'declar', 'defin', 'deliver', 'demand', 'deposit', 'design', 'detail', 'determin', 'develop',
+    'direct', 'discount', 'display', 'distribut', 'document', 'draft', 'earn', 'edit', 'educat', 'effect', 'employ',
+    'enabl', 'enter', 'equip', 'establish', 'estimat', 'evaluat', 'exchang', 'expect', 'expens', 'explain',
+    'export', 'express', 'factor', 'file', 'financ', 'fix', 'form', 'forward', 'found', 'fund', 'govern', 'grant',
+    'guarant', 'handl', 'hold', 'identif', 'import', 'improv', 'includ', 'increas', 'index', 'inform', 'insur',
+    'interest', 'invent', 'invest', 'invoic', 'issu', 'join', 'judg', 'keep', 'label', 'lend', 'licens', 'limit',
+    'list', 'load', 'loan', 'locat', 'lock', 'manag', 'manufactur', 'mark', 'match', 'measur', 'merg', 'migrat',
+    'model', 'monitor', 'mortgag', 'mov', 'negotiat', 'not', 'number', 'offer', 'open', 'operat', 'order',
+    'organiz', 'own', 'pack', 'pay', 'perform', 'permit', 'plan', 'point', 'posit', 'post', 'pric', 'print',
+    'process', 'produc', 'profit', 'program', 'project', 'promot', 'protect', 'provid', 'publish', 'purchas',
+    'qualif', 'quot', 'rat', 'receiv', 'record', 'reduc', 'refund', 'regist', 'regulat', 'releas', 'rent', 'repair',
+    'report', 'request', 'reserv', 'resolv', 'return', 'review', 'sal', 'sav', 'schedul', 'secur', 'sell', 'send',
+    'servic', 'settl', 'ship', 'sign', 'stock', 'stor', 'submit', 'suppl', 'support', 'tax', 'test', 'trad',
+    'train', 'transfer', 'transport', 'trust', 'updat', 'valid', 'valu', 'verif', 'view', 'withdraw', 'work',
+]
+PREFIXES = ['', '', '', 're', 'pre', 'un', 'non', 'over', 'under', 'co', 'sub', 'inter', 'mis', 'out', 'de']
+SUFFIXES = ['', 'e', 'es', 'ed', 'er', 'ers', 'ing', 'ings', 'ion', 'ions', 'ation', 'ations', 'ment', 'ments',
+            'able', 'ability', 'al', 'ally', 'ive', 'ively', 'or', 'ors', 'ance', 'ence', 'y', 'ies', 'ist', 'ists']
+CONNECTORS = [' of ', ' for ', ' and ', ' to ', ' in ', ' ', '-']
+
+
+def synthetic(size: int, seed: int = 0) -> List[str]:
+    """ Generate random terms with a uniform alphabet, which share few prefixes and suffixes.
+
+    :param size: The number of different terms.
+    :param seed: The random seed.
+    :return: The list of terms.
+    """
+    rnd, terms = random.Random(seed), {}
+    while len(terms) < size:
+        terms[''.join(rnd.choice(ALPHABET) for _ in range(rnd.randint(4, 14)))] = None
+    return list(terms)
+
+
+def english(size: int, seed: int = 0) -> List[str]:
+    """ Generate English-like words and multi-word terms, like "point of sale", from the bundled stems and affixes.
+       The first terms are single words, and when there are not enough of them, the terms are combined.
+
+    :param size: The number of different terms.
+    :param seed: The random seed.
+    :return: The list of terms.
+    """
+    rnd = random.Random(seed)
+    words = list(dict.fromkeys(prefix + stem + suffix for stem in STEMS for prefix in PREFIXES for suffix in SUFFIXES))
+    rnd.shuffle(words)
+    terms = dict.fromkeys(words[:size])
+    while len(terms) < size:
+        terms[rnd.choice(words) + rnd.choice(CONNECTORS) + rnd.choice(words)] = None
+    return list(terms)
+
+
+def from_file(path: str) -> Callable[[int, int], List[str]]:
+    """ Create a generator of terms from a file with a term per line, like /usr/share/dict/words.
+
+    :param path: The file path.
+    :return: A generator that returns a random sample of the terms of the file.
+    """
+    def generate(size: int, seed: int = 0) -> List[str]:
+        with open(path, encoding='utf-8') as file:
+            terms = list(dict.fromkeys(line.strip() for line in file if line.strip()))
+        random.Random(seed).shuffle(terms)
+        return terms[:size]
+    return generate
+
+
+GENERATORS: Dict[str, Callable[[int, int], List[str]]] = {'synthetic': synthetic, 'english': english}
+
+
+def misspell(term: str, rnd: random.Random, edits: int = 1) -> str:
+    """ Apply random insertions, deletions and replacements to a term, to simulate spelling mistakes.
+
+    :param term: The term.
+    :param rnd: The random generator.
+    :param edits: The number of edits.
+    :return: The misspelled term.
+    """
+    for _ in range(edits):
+        pos, operation = rnd.randrange(len(term) + 1), rnd.choice(['insert', 'delete', 'replace'])
+        if operation == 'insert' or pos == len(term):
+            term = term[:pos] + rnd.choice(ALPHABET) + term[pos:]
+        elif operation == 'delete' and len(term) > 1:
+            term = term[:pos] + term[pos + 1:]
+        else:
+            term = term[:pos] + rnd.choice(ALPHABET) + term[pos + 1:]
+    return term
@@ -1,2 +1,2 @@
-from .consts import INIT_NODE, FINAL_NODE
+from .consts import INIT_NODE, FINAL_NODE, BEST_FIRST, ROWS, AUTOMATON
 from .graph import Graph, TextGraph
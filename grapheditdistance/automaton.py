@@ -0,0 +1,194 @@
+from typing import Sequence, Hashable, List, Tuple
+
+from grapheditdistance.consts import INIT_NODE
+from grapheditdistance.base import BaseGraph
+from grapheditdistance.distances import EditDistance, Levenshtein
+from grapheditdistance.rows import backtrace
+from grapheditdistance.stats import SearchStats
+
+# The state of the automaton when the entity cannot be matched within the edit budget anymore
+DEAD = -1
+# The transition key of the symbols which are not in the entity
+OTHER = None
+
+
+class LevenshteinAutomaton(object):
+    """ A deterministic Levenshtein automaton, which accepts the sequences of symbols within a maximum number of
+       unit cost edits of an entity. Each state is a sparse Levenshtein row with the cells that do not exceed
+       the budget, and all the symbols which are not in the entity share the same transition. The automaton is
+       compiled lazily: each state and transition is only calculated the first time it is needed.
+    """
+    def __init__(self, symbols: Sequence[int], max_edits: int) -> None:
+        """ Constructor.
+
+        :param symbols: The symbol ids of the entity elements.
+        :param max_edits: The maximum number of edits.
+        """
+        self._symbols, self._elements, self._max_edits = list(symbols), set(symbols), max_edits
+        # The sparse row, the transitions and the edits of the entity end, or -1, of each state
+        self._rows, self._transitions, self._edits = [], [], []
+        self._states = {}
+        self.start = self._state(tuple((i, i) for i in range(min(len(symbols), max_edits) + 1)))
+
+    def __len__(self) -> int:
+        """
+        :return: The number of states compiled so far.
+        """
+        return len(self._rows)
+
+    def step(self, state: int, symbol: int) -> int:
+        """ The transition of a state with a symbol.
+
+        :param state: The current state.
+        :param symbol: The symbol id.
+        :return: The next state, or DEAD if the entity cannot be matched within the budget anymore.
+        """
+        transitions = self._transitions[state]
+        key = symbol if symbol in self._elements else OTHER
+        next_state = transitions.get(key)
+        if next_state is None:
+            next_state = transitions[key] = self._state(self._next_row(self._rows[state], key))
+        return next_state
+
+    def edits(self, state: int) -> int:
+        """
+        :param state: The state.
+        :return: The number of edits to transform the entity into the symbols read until this state,
+           or -1 if it exceeds the budget.
+        """
+        return self._edits[state]
+
+    def _state(self, row: Tuple[Tuple[int, int], ...]) -> int:
+        """ Get or create the state of a sparse row.
+
+        :param row: A tuple with the position and the edits of each cell within the budget.
+        :return: The state id, or DEAD if the row is empty.
+        """
+        if not row:
+            return DEAD
+        state = self._states.get(row)
+        if state is None:
+            state = self._states[row] = len(self._rows)
+            self._rows.append(row)
+            self._transitions.append({})
+            self._edits.append(row[-1][1] if row[-1][0] == len(self._symbols) else -1)
+        return state
+
+    def _next_row(self, row: Tuple[Tuple[int, int], ...], symbol: int) -> Tuple[Tuple[int, int], ...]:
+        """ Calculate the next sparse row. With unit costs, two contiguous cells differ by one edit at most,
+           then, a missing cell cannot reduce the next ones.
+
+        :param row: The current sparse row.
+        :param symbol: The read symbol id, or OTHER.
+        :return: The next sparse row.
+        """
+        symbols, max_edits = self._symbols, self._max_edits
+        new_row = [(0, row[0][1] + 1)] if row[0][0] == 0 and row[0][1] < max_edits else []
+        for i, (pos, edits) in enumerate(row):
+            if pos == len(symbols):
+                break
+            # Replace or keep the entity element, insert it, or delete the read symbol
+            edits += symbols[pos] != symbol
+            if new_row and new_row[-1][0] == pos:
+                edits = min(edits, new_row[-1][1] + 1)
+            if i + 1 < len(row) and row[i + 1][0] == pos + 1:
+                edits = min(edits, row[i + 1][1] + 1)
+            if edits <= max_edits:
+                new_row.append((pos + 1, edits))
+        return tuple(new_row)
+
+
+def supports(distance: EditDistance) -> bool:
+    """ Check if a distance can be searched with a Levenshtein automaton.
+
+    :param distance: The distance.
+    :return: True if it is a plain Levenshtein distance with the same positive cost for all the operations.
+    """
+    return type(distance) is Levenshtein and \
+        distance.min_insert_cost == distance.min_delete_cost == distance.min_replace_cost > 0
+
+
+def max_edits(distance: Levenshtein, limit: float) -> int:
+    """ The edit budget of a limit. The costs are added one by one like the other engines do, to obtain exactly
+       the same results in spite of floating point rounding errors.
+
+    :param distance: A distance supported by the automaton.
+    :param limit: The maximum edition distance.
+    :return: The maximum number of edits whose cost does not exceed the limit, -1 if the limit is negative.
+    """
+    cost, edits, total = distance.min_replace_cost, -1, 0.
+    while total <= limit:
+        edits, total = edits + 1, total + cost
+    return edits
+
+
+def search(graph: BaseGraph,
+           entity: Sequence[Hashable],
+           threshold: float = 0.8,
+           nbest: int = 1,
+           stats: SearchStats = None) -> List[tuple]:
+    """ Search an entity intersecting a Levenshtein automaton of the entity with the graph trie. The trie is walked
+       in depth together with the automaton, and the subtree of a node is pruned when its automaton state is dead.
+       Only the operators of the returned results are calculated.
+
+    :param graph: The graph to search in. Its distance has to be supported by the automaton (see supports()).
+    :param entity: The entity to search.
+    :param threshold: The edit distance threshold with respect to the length of the entity.
+    :param nbest: The number of best results. If 0, then return all the results that exceed the threshold.
+    :param stats: The statistics to update, or None to not collect them. Each walked node is an expansion.
+    :return: The same results as the ROWS engine.
+    """
+    distance, trie = graph.distance, graph._trie
+    budget = max_edits(distance, len(entity) * (1 - threshold))
+    if budget < 0:
+        return []
+    automaton = LevenshteinAutomaton(graph.encode(entity), budget)
+    # The values and nodes of the current path, where the nodes start with the init node
+    values, nodes, found = [], [INIT_NODE], []
+    step, symbol, children = automaton.step, trie.symbol, trie.children
+    # Each node to walk has its depth and its automaton state. The children with a dead state are never pushed.
+    stack, node, depth, state = [], INIT_NODE, 0, automaton.start
+    while True:
+        for child in reversed(list(children(node))):
+            next_state = step(state, symbol(child))
+            if next_state != DEAD:
+                stack.append((child, depth + 1, next_state))
+            elif stats is not None:
+                stats.pruned_by_threshold += 1
+        if stats is not None:
+            stats.peak_frontier = max(stats.peak_frontier, len(stack))
+        if not stack:
+            break
+        node, depth, state = stack.pop()
+        del values[depth - 1:], nodes[depth:]
+        values.append(trie.value(node))
+        nodes.append(node)
+        if trie.is_final(node) and automaton.edits(state) >= 0:
+            found.append((automaton.edits(state), len(found), list(values), list(nodes)))
+        if stats is not None:
+            stats.expansions += 1
+    found.sort()
+    return [graph._result(values, *_alignment(distance, entity, values, nodes), nodes[-1])
+            for _, _, values, nodes in (found[:nbest] if nbest else found)]
+
+
+def _alignment(distance: Levenshtein, entity: Sequence[Hashable], values: List[Hashable], nodes: List[int]) -> tuple:
+    """ Calculate the Levenshtein rows of a found entity and its best list of operators.
+
+    :param distance: A distance supported by the automaton, where all the operations have the same cost.
+    :param entity: The searched entity.
+    :param values: The values of the found entity.
+    :param nodes: The nodes of the found entity, starting with the init node.
+    :return: A tuple with the edition distance and the list of operators.
+    """
+    cost = distance.min_replace_cost
+    row = [0.]
+    for _ in entity:
+        row.append(row[-1] + cost)
+    rows = [row]
+    for value in values:
+        prev_row, row = row, [row[0] + cost]
+        for i, element in enumerate(entity, 1):
+            row.append(min(prev_row[i] + cost, row[-1] + cost, prev_row[i - 1] + (0 if element == value else cost)))
+        rows.append(row)
+    return row[-1], backtrace(distance, entity, rows, values, nodes)
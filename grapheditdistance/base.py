@@ -1,10 +1,6 @@
 from abc import ABC, ABCMeta, abstractmethod
 from typing import Hashable, Sequence, Iterable, List
 
-from networkx.classes.reportviews import NodeView
-
-VALUE, NEIGHBORS, WEIGHT = 'value', 'neighbors', 'weight'
-
 
 class BaseGraph(ABC):
     """ An abstract graph. """
@@ -12,18 +8,19 @@ class BaseGraph(ABC):
 
     @property
     @abstractmethod
-    def nodes(self) -> NodeView:
+    def nodes(self) -> Iterable[int]:
         """
         :return: The graph nodes.
         """
         pass
 
+    @abstractmethod
     def neighbors(self, node: int) -> dict:
         """ The following neighbors of that node.
         :param node: The node id.
         :return: A dictionary with the neighbors.
         """
-        return self.nodes[node][NEIGHBORS]
+        pass
 
     def get_neighbor(self, value: Hashable, node: int, default: int = None) -> int:
         """ Get a given neighbor with a given value.
@@ -35,6 +32,7 @@ class BaseGraph(ABC):
         """
         return self.neighbors(node).get(value, default)
 
+    @abstractmethod
     def set_neighbor(self, prev_node: int, node: int, value: Hashable) -> None:
         """ Set a neighbor to this node.
 
@@ -42,7 +40,7 @@ class BaseGraph(ABC):
         :param node: The current node.
         :param value: The value of the node.
         """
-        self.neighbors(prev_node)[value] = node
+        pass
 
     @abstractmethod
     def add(self, entity: Sequence[Hashable]) -> None:
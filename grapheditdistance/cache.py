@@ -0,0 +1,91 @@
+from collections import OrderedDict
+from threading import Lock
+from time import monotonic
+from typing import Hashable, Any, Optional
+
+
+class SearchCache(object):
+    """ A bounded cache of search results. When it is full, the least recently used result is evicted.
+       Optionally, the results expire after a given time to live.
+    """
+    @property
+    def hits(self) -> int:
+        """
+        :return: The number of times a result was found in the cache.
+        """
+        return self._hits
+
+    @property
+    def misses(self) -> int:
+        """
+        :return: The number of times a result was not found in the cache.
+        """
+        return self._misses
+
+    @property
+    def maxsize(self) -> int:
+        """
+        :return: The maximum number of results in the cache.
+        """
+        return self._maxsize
+
+    @property
+    def ttl(self) -> Optional[float]:
+        """
+        :return: The time to live of each result in seconds, or None if the results do not expire.
+        """
+        return self._ttl
+
+    def __init__(self, maxsize: int = 1024, ttl: float = None) -> None:
+        """ Constructor.
+
+        :param maxsize: The maximum number of results in the cache.
+        :param ttl: The time to live of each result in seconds. By default, the results do not expire.
+        """
+        if maxsize < 1:
+            raise ValueError(f'The cache size has to be greater than 0, not {maxsize}.')
+        self._maxsize, self._ttl = maxsize, ttl
+        self._results = OrderedDict()
+        self._hits = self._misses = 0
+        self._lock = Lock()
+
+    def __len__(self) -> int:
+        """
+        :return: The number of results in the cache, including the expired ones which have not been evicted yet.
+        """
+        return len(self._results)
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """ Get a result from the cache.
+
+        :param key: The result key.
+        :param default: The value to return if the key is not in the cache or its result has expired.
+        :return: The result.
+        """
+        with self._lock:
+            expiration, result = self._results.get(key, (None, default))
+            if expiration is not None and (self._ttl is None or expiration > monotonic()):
+                self._results.move_to_end(key)
+                self._hits += 1
+                return result
+            if expiration is not None:
+                del self._results[key]
+            self._misses += 1
+            return default
+
+    def put(self, key: Hashable, result: Any) -> None:
+        """ Add a result to the cache, evicting the least recently used one if the cache is full.
+
+        :param key: The result key.
+        :param result: The result.
+        """
+        with self._lock:
+            self._results[key] = (monotonic() + self._ttl if self._ttl is not None else 0, result)
+            self._results.move_to_end(key)
+            if len(self._results) > self._maxsize:
+                self._results.popitem(last=False)
+
+    def clear(self) -> None:
+        """ Remove all the results from the cache. The hit and miss counters are not reset. """
+        with self._lock:
+            self._results.clear()
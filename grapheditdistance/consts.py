@@ -1,2 +1,10 @@
-INIT_NODE = -1
+INIT_NODE = 0
 FINAL_NODE = -2
+
+# Search engines
+BEST_FIRST = 'best-first'
+ROWS = 'rows'
+AUTOMATON = 'automaton'
+
+# The tolerance to compare accumulated costs with estimated ones, because of floating point rounding errors
+TOLERANCE = 1e-9
@@ -1,2 +1,4 @@
 from .base import EditDistance
 from .levenshtein import Levenshtein, WeightedLevenshtein
+from .damerau_levenshtein import DamerauLevenshtein
+from .tables import CostTables
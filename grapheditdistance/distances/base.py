@@ -26,6 +26,63 @@ class EditDistance(ABC):
         """
         return [('default', 1.)]
 
+    @property
+    def config(self) -> Hashable:
+        """ A hashable representation of the distance configuration, used for example to cache the search results.
+           By default, it is the distance object identity, therefore, the subclasses with a configuration that can
+           change should override this property.
+
+        :return: A hashable object that changes when the distance configuration changes.
+        """
+        return type(self), id(self)
+
+    def state(self, operators: List[Operator]) -> Hashable:
+        """ Summarize the operators used to arrive to a node in a hashable key. Two paths that arrive to the same
+           node and position with the same key must receive the same operators from costs() in the future.
+           By default, the full sequence of operators is used, which is always safe.
+
+        :param operators: The list of operators to arrive to the current node.
+        :return: A hashable key.
+        """
+        return tuple(operators)
+
+    @property
+    def integer_costs(self) -> bool:
+        """ If all the costs of the operators returned by costs() are non-negative integer numbers. Then, the search
+           can use a faster frontier. By default, False, which is always safe. The subclasses that return
+           operators with other costs have to override this property.
+
+        :return: True if all the operator costs are non-negative integers, otherwise False.
+        """
+        return False
+
+    @property
+    def min_insert_cost(self) -> float:
+        """ A lower bound of the cost of inserting any element, used to estimate the remaining cost of a search path.
+           By default, 0, which is always safe but does not allow to prune or guide the search.
+
+        :return: The minimum insertion cost.
+        """
+        return 0.
+
+    @property
+    def min_delete_cost(self) -> float:
+        """ A lower bound of the cost of deleting any element, used to estimate the remaining cost of a search path.
+           By default, 0, which is always safe but does not allow to prune or guide the search.
+
+        :return: The minimum deletion cost.
+        """
+        return 0.
+
+    @property
+    def min_replace_cost(self) -> float:
+        """ A lower bound of the cost of replacing any element by a different one, used to estimate the remaining
+           cost of a search path. By default, 0, which is always safe but does not allow to prune or guide the search.
+
+        :return: The minimum replacement cost.
+        """
+        return 0.
+
     @property
     @abstractmethod
     def max_cost(self) -> float:
@@ -41,7 +98,7 @@ class EditDistance(ABC):
               graph: BaseGraph,
               curr_node: int,
               next_node: int,
-              operators: List[Operator]) -> List[Operator]:
+              operators: Sequence[Operator]) -> List[Operator]:
         """ This method should return a list of operators with the different costs of each operation.
 
         :param pos: The current position of the entity.
@@ -49,7 +106,8 @@ class EditDistance(ABC):
         :param graph: The graph.
         :param curr_node: The current node.
         :param next_node: The next node.
-        :param operators: The list of operators to arrive to the current node.
+        :param operators: The sequence of operators to arrive to the current node. During the search, it is an
+           OperatorChain, where the last operator is accessed in constant time, but the rest of them are not.
         :return: The different operators to explore and add to the previous list of operators.
         """
         pass
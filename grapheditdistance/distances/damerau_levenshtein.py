@@ -0,0 +1,104 @@
+from typing import Sequence, List, Hashable, Any
+
+from grapheditdistance import FINAL_NODE
+from grapheditdistance.base import BaseGraph
+from grapheditdistance.distances.levenshtein import Levenshtein
+from grapheditdistance.operators import Operator, TransposeOperator
+
+
+class DamerauLevenshtein(Levenshtein):
+    """ The Levenshtein algorithm with transpositions of two adjacent elements, like "teh" and "the", which cost
+       one operation instead of two. Each transposed element cannot be edited again (optimal string alignment).
+       The ROWS engine and search_batch() do not support this distance.
+    """
+    _cost_methods = Levenshtein._cost_methods + ('transpose_cost',)
+
+    @property
+    def min_insert_cost(self) -> float:
+        """ The transpositions do not change the number of elements, therefore, the insertion bound is still valid.
+
+        :return: The minimum insertion cost.
+        """
+        return super().min_insert_cost
+
+    @property
+    def min_delete_cost(self) -> float:
+        """ The transpositions do not change the number of elements, therefore, the deletion bound is still valid.
+
+        :return: The minimum deletion cost.
+        """
+        return super().min_delete_cost
+
+    @property
+    def min_replace_cost(self) -> float:
+        """ The transpositions only swap elements which are in the graph, therefore, the elements that are not below
+           a node still have to be inserted or replaced.
+
+        :return: The minimum replacement cost.
+        """
+        return super().min_replace_cost
+
+    @property
+    def config(self) -> Hashable:
+        """
+        :return: A tuple with the distance class and its costs.
+        """
+        return super().config + (self._transpose_cost,)
+
+    def __init__(self,
+                 insert_cost: float = 1,
+                 delete_cost: float = 1,
+                 replace_cost: float = 1,
+                 transpose_cost: float = 1) -> None:
+        """ Constructor from the different costs.
+
+        :param insert_cost: The cost to insert an element.
+        :param delete_cost: The cost to delete an element.
+        :param replace_cost: The cost to replace an element by other one.
+        :param transpose_cost: The cost to swap two adjacent elements.
+        """
+        super().__init__(insert_cost, delete_cost, replace_cost)
+        self._transpose_cost = transpose_cost
+        self._max_cost = max(self._max_cost, transpose_cost)
+
+    def _costs(self) -> List[float]:
+        """
+        :return: All the possible insertion, deletion, replacement and transposition costs.
+        """
+        return super()._costs() + [self._transpose_cost]
+
+    def transpose_cost(self, first: Any, second: Any) -> float:
+        """ Calculate the transposition cost.
+
+        :param first: The first element of the entity to swap.
+        :param second: The second element of the entity to swap.
+        :return: The operator cost.
+        """
+        return self._transpose_cost
+
+    def costs(self,
+              pos: int,
+              entity: Sequence[Hashable],
+              graph: BaseGraph,
+              curr_node: int,
+              next_node: int,
+              operators) -> List[Operator]:
+        """ The Levenshtein operators, and a transposition if the next two elements of the entity are swapped
+           in the next two graph nodes.
+
+        :param pos: The current position of the entity.
+        :param entity: The entity is a sequence of hashable elements
+        :param graph: The graph.
+        :param curr_node: The current node.
+        :param next_node: The next node.
+        :param operators: The list of operators to arrive to the current node.
+        :return: The different operators to explore and add to the previous list of operators.
+        """
+        new_operators = super().costs(pos, entity, graph, curr_node, next_node, operators)
+        if next_node != FINAL_NODE and pos + 1 < len(entity):
+            first, second = entity[pos], entity[pos + 1]
+            if first != second and graph.value(next_node) == second:
+                node = graph.get_neighbor(first, next_node)
+                if node is not None:
+                    new_operators.append(TransposeOperator(self.transpose_cost(first, second), first, second, node))
+        return new_operators
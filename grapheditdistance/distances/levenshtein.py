@@ -1,14 +1,38 @@
 from grapheditdistance import FINAL_NODE
 from grapheditdistance.base import BaseGraph
 from grapheditdistance.distances import EditDistance
+from functools import lru_cache
 from typing import Sequence, List, Hashable, Any
 
+import numpy as np
+
+from grapheditdistance.distances.tables import CostTables
+
 from grapheditdistance.operators import Operator, NoneOperator, ReplaceOperator, DeleteOperator, InsertOperator, \
     FinalOperator
 
 
+@lru_cache(maxsize=None)
+def _owner(cls: type, attribute: str) -> type:
+    """ Find the class that defines an attribute.
+
+    :param cls: The class to inspect.
+    :param attribute: The attribute name.
+    :return: The first class in the method resolution order of cls that defines the attribute.
+    """
+    return next(base for base in cls.__mro__ if attribute in vars(base))
+
+
 class Levenshtein(EditDistance):
     """ Implements the edit distances methods for the Levenshtein algorithm. """
+    # The methods that calculate the cost of each operation, and the ones that create the operators with them
+    _cost_methods = ('insert_cost', 'delete_cost', 'replace_cost', 'costs', '_calculate_insert_cost',
+                     '_calculate_delete_cost')
+    # The methods that the lower bound of each operation cost depends on
+    _insert_methods = ('insert_cost', 'costs', '_calculate_insert_cost')
+    _delete_methods = ('delete_cost', 'costs', '_calculate_delete_cost')
+    _replace_methods = ('replace_cost', 'costs')
+
     @property
     def max_cost(self):
         """
@@ -16,6 +40,43 @@ class Levenshtein(EditDistance):
         """
         return self._max_cost
 
+    @property
+    def integer_costs(self) -> bool:
+        """
+        :return: True if the insertion, deletion and replacement costs are non-negative integers, otherwise False.
+           Also False if a subclass overrides the cost methods or costs(), because their costs are unknown.
+        """
+        return self._defines_costs('_costs', *self._cost_methods) and \
+            all(float(cost).is_integer() and cost >= 0 for cost in self._costs())
+
+    @property
+    def min_insert_cost(self) -> float:
+        """
+        :return: The minimum insertion cost, or 0 if a subclass overrides how the insertions are calculated.
+        """
+        return self._insert_cost if self._defines_costs('min_insert_cost', *self._insert_methods) else 0.
+
+    @property
+    def min_delete_cost(self) -> float:
+        """
+        :return: The minimum deletion cost, or 0 if a subclass overrides how the deletions are calculated.
+        """
+        return self._delete_cost if self._defines_costs('min_delete_cost', *self._delete_methods) else 0.
+
+    @property
+    def min_replace_cost(self) -> float:
+        """
+        :return: The minimum replacement cost, or 0 if a subclass overrides how the replacements are calculated.
+        """
+        return self._replace_cost if self._defines_costs('min_replace_cost', *self._replace_methods) else 0.
+
+    @property
+    def config(self) -> Hashable:
+        """
+        :return: A tuple with the distance class and its costs.
+        """
+        return type(self), self._insert_cost, self._delete_cost, self._replace_cost
+
     def __init__(self, insert_cost: float = 1, delete_cost: float = 1, replace_cost: float = 1) -> None:
         """ Constructor from the different costs.
 
@@ -28,6 +89,31 @@ class Levenshtein(EditDistance):
         self._replace_cost = replace_cost
         self._max_cost = max([self._insert_cost, self._delete_cost, self._replace_cost])
 
+    def _costs(self) -> List[float]:
+        """
+        :return: All the possible insertion, deletion and replacement costs.
+        """
+        return [self._insert_cost, self._delete_cost, self._replace_cost]
+
+    def _defines_costs(self, attribute: str, *methods: str) -> bool:
+        """ Check if an attribute that summarizes the costs, like a lower bound, is valid. It is not if a subclass
+           overrides any of the methods that calculate those costs without defining the attribute again.
+
+        :param attribute: The attribute name.
+        :param methods: The names of the cost methods summarized by the attribute.
+        :return: True if the class that defines the attribute is the class that defines each method or a subclass.
+        """
+        owner = _owner(type(self), attribute)
+        return all(issubclass(owner, _owner(type(self), method)) for method in methods)
+
+    def cost_tables(self) -> CostTables:
+        """ Compile the costs in dense NumPy arrays, to calculate several of them at once.
+
+        :return: The cost tables, where all the elements have the same code.
+        """
+        return CostTables({}, np.array([self._insert_cost], float), np.array([self._delete_cost], float),
+                          np.array([[self._replace_cost]], float))
+
     def insert_cost(self, element: Any) -> float:
         """ Calculate the insertion cost.
 
@@ -94,6 +180,22 @@ class Levenshtein(EditDistance):
                 new_operators.append(DeleteOperator(weight, next_value, next_node))
         return new_operators
 
+    def state(self, operators: List[Operator]) -> Hashable:
+        """ Summarize the operators used to arrive to a node. Only the last operator matters in this algorithm,
+           and only if it is an insertion or a deletion, because of the penalty to avoid opposite consecutive
+           operations with the same element.
+
+        :param operators: The list of operators to arrive to the current node.
+        :return: A hashable key with the last insertion or deletion, or None.
+        """
+        if operators:
+            operator = operators[-1]
+            if isinstance(operator, InsertOperator):
+                return InsertOperator, operator.inserted_element
+            if isinstance(operator, DeleteOperator):
+                return DeleteOperator, operator.deleted_element
+        return None
+
     def _calculate_insert_cost(self, entity: Sequence[Hashable], operators: List[Operator], value: Hashable) -> float:
         """ Calculate the final insert operation cost depending on if the previous operator is the
            opposite one (a delete operation) with the same element.
@@ -142,6 +244,42 @@ class WeightedLevenshtein(Levenshtein):
         """
         return self._max_cost
 
+    @property
+    def min_insert_cost(self) -> float:
+        """
+        :return: The minimum insertion cost, including the specific ones.
+        """
+        if not self._defines_costs('min_insert_cost', *self._insert_methods):
+            return 0.
+        return min([self._insert_cost, *self._custom_insert_costs.values()])
+
+    @property
+    def min_delete_cost(self) -> float:
+        """
+        :return: The minimum deletion cost, including the specific ones.
+        """
+        if not self._defines_costs('min_delete_cost', *self._delete_methods):
+            return 0.
+        return min([self._delete_cost, *self._custom_delete_costs.values()])
+
+    @property
+    def min_replace_cost(self) -> float:
+        """
+        :return: The minimum replacement cost, including the specific ones.
+        """
+        if not self._defines_costs('min_replace_cost', *self._replace_methods):
+            return 0.
+        return min([self._replace_cost, *self._custom_replace_costs.values()])
+
+    @property
+    def config(self) -> Hashable:
+        """
+        :return: A tuple with the distance class, its default costs and its specific costs.
+        """
+        return super().config + (frozenset(self._custom_insert_costs.items()),
+                                 frozenset(self._custom_delete_costs.items()),
+                                 frozenset(self._custom_replace_costs.items()))
+
     def __init__(self, insert_cost: float = 1, delete_cost: float = 1, replace_cost: float = 1) -> None:
         """ Constructor from the different costs.
 
@@ -154,6 +292,8 @@ class WeightedLevenshtein(Levenshtein):
         self._custom_insert_costs = {}
         self._custom_delete_costs = {}
         self._custom_replace_costs = {}
+        # The compiled cost tables, which are created again when the costs change
+        self._tables = None
 
     def add_insert_cost(self, element: Any, cost: float) -> None:
         """ Add an insertion cost for a specific inserted element.
@@ -163,6 +303,7 @@ class WeightedLevenshtein(Levenshtein):
         """
         self._custom_insert_costs[element] = cost
         self._max_cost = max([cost, self._max_cost])
+        self._tables = None
 
     def add_delete_cost(self, element: Any, cost: float) -> None:
         """ Add a deletion cost for a specific deleted element.
@@ -172,6 +313,7 @@ class WeightedLevenshtein(Levenshtein):
         """
         self._custom_delete_costs[element] = cost
         self._max_cost = max([cost, self._max_cost])
+        self._tables = None
 
     def add_replace_cost(self, fr: Any, to: Any, cost: float) -> None:
         """ Add a replacement cost for a specific replace rule.
@@ -182,6 +324,37 @@ class WeightedLevenshtein(Levenshtein):
         """
         self._custom_replace_costs[(fr, to)] = cost
         self._max_cost = max([cost, self._max_cost])
+        self._tables = None
+
+    def _costs(self) -> List[float]:
+        """
+        :return: All the possible insertion, deletion and replacement costs, including the specific ones.
+        """
+        return super()._costs() + list(self._custom_insert_costs.values()) + \
+            list(self._custom_delete_costs.values()) + list(self._custom_replace_costs.values())
+
+    def cost_tables(self) -> CostTables:
+        """ Compile the costs in dense NumPy arrays, to calculate several of them at once. The alphabet is
+           the elements of the specific costs. The tables are only compiled again when the costs change.
+
+        :return: The cost tables.
+        """
+        if getattr(self, '_tables', None) is None:
+            alphabet = {}
+            for element in [*self._custom_insert_costs, *self._custom_delete_costs,
+                            *(element for pair in self._custom_replace_costs for element in pair)]:
+                alphabet.setdefault(element, len(alphabet))
+            insert_costs = np.full(len(alphabet) + 1, self._insert_cost, float)
+            insert_costs[[alphabet[element] for element in self._custom_insert_costs]] = \
+                list(self._custom_insert_costs.values())
+            delete_costs = np.full(len(alphabet) + 1, self._delete_cost, float)
+            delete_costs[[alphabet[element] for element in self._custom_delete_costs]] = \
+                list(self._custom_delete_costs.values())
+            replace_costs = np.full((len(alphabet) + 1, len(alphabet) + 1), self._replace_cost, float)
+            for (fr, to), cost in self._custom_replace_costs.items():
+                replace_costs[alphabet[fr], alphabet[to]] = cost
+            self._tables = CostTables(alphabet, insert_costs, delete_costs, replace_costs)
+        return self._tables
 
     def insert_cost(self, element: Any) -> float:
         """ Calculate the insertion cost.
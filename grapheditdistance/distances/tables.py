@@ -0,0 +1,41 @@
+from typing import Any, Dict, Hashable, Iterable
+
+import numpy as np
+
+
+class CostTables(object):
+    """ The costs of a Levenshtein distance compiled in dense NumPy arrays. The elements with specific costs are
+       interned in a small alphabet, and all the other elements share the last code, which has the default costs.
+    """
+    def __init__(self,
+                 alphabet: Dict[Hashable, int],
+                 insert_costs: np.ndarray,
+                 delete_costs: np.ndarray,
+                 replace_costs: np.ndarray) -> None:
+        """ Constructor.
+
+        :param alphabet: The code of each element with specific costs, from 0 to the alphabet length - 1.
+        :param insert_costs: The insertion cost of each code.
+        :param delete_costs: The deletion cost of each code.
+        :param replace_costs: A matrix with the cost to replace the element of each row code by the element of each
+           column code. The costs between equal elements are not used, because they are not replaced.
+        """
+        self.alphabet = alphabet
+        self.insert_costs, self.delete_costs, self.replace_costs = insert_costs, delete_costs, replace_costs
+
+    def code(self, element: Any) -> int:
+        """ The code of an element.
+
+        :param element: The element.
+        :return: Its code in the alphabet, or the alphabet length if it does not have specific costs.
+        """
+        return self.alphabet.get(element, len(self.alphabet))
+
+    def encode(self, elements: Iterable[Any]) -> np.ndarray:
+        """ The codes of several elements.
+
+        :param elements: The elements.
+        :return: An array with the code of each element.
+        """
+        other = len(self.alphabet)
+        return np.array([self.alphabet.get(element, other) for element in elements], np.intp)
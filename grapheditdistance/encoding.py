@@ -0,0 +1,47 @@
+from typing import Dict, List
+
+from grapheditdistance.trie import symbol_bit
+
+
+class EncodedEntity(object):
+    """ An entity to search encoded with the symbol ids of a graph. The positions of the elements with each symbol
+       bit are stored as a bit mask, to count the elements which are not below a node with a few integer operations.
+    """
+    __slots__ = ('symbols', '_positions', '_present')
+
+    def __init__(self, symbols: List[int]) -> None:
+        """ Constructor.
+
+        :param symbols: The symbol id of each element, NO_NODE if it is not in the graph.
+        """
+        self.symbols = symbols
+        # The bit mask of the positions of each symbol bit
+        self._positions: Dict[int, int] = {}
+        for pos, symbol in enumerate(symbols):
+            bit = symbol_bit(symbol)
+            if bit:
+                self._positions[bit] = self._positions.get(bit, 0) | 1 << pos
+        # The bit mask of the positions whose symbol bit is in each node symbol mask
+        self._present: Dict[int, int] = {}
+
+    def __len__(self) -> int:
+        """
+        :return: The number of elements.
+        """
+        return len(self.symbols)
+
+    def missing(self, pos: int, symbol_mask: int) -> int:
+        """ Count the elements which are not in a symbol summary.
+
+        :param pos: The first position to count.
+        :param symbol_mask: The symbol summary of a node.
+        :return: The number of elements from that position whose symbol bit is not in the summary.
+        """
+        present = self._present.get(symbol_mask)
+        if present is None:
+            present = 0
+            for bit, positions in self._positions.items():
+                if bit & symbol_mask:
+                    present |= positions
+            self._present[symbol_mask] = present
+        return len(self.symbols) - pos - bin(present >> pos).count('1')
@@ -0,0 +1,114 @@
+from abc import ABC, ABCMeta, abstractmethod
+from heapq import heappush, heappop
+from typing import Any, Tuple
+
+
+class Frontier(ABC):
+    """ A priority queue of the paths to explore. The paths are extracted in increasing order of key, and the paths
+       with the same key in reverse order of insertion, this is, the last inserted one is the first extracted one.
+    """
+    __metaclass__ = ABCMeta
+
+    @abstractmethod
+    def push(self, key: float, value: Any) -> None:
+        """ Add a path.
+
+        :param key: The path key.
+        :param value: The path.
+        """
+        pass
+
+    @abstractmethod
+    def pop(self) -> Tuple[float, Any]:
+        """ Extract the path with the lowest key.
+
+        :return: A tuple with the key and the path.
+        :raise IndexError: If the frontier is empty.
+        """
+        pass
+
+    @abstractmethod
+    def __len__(self) -> int:
+        """
+        :return: The number of paths.
+        """
+        pass
+
+
+class BucketFrontier(Frontier):
+    """ A bucket queue (Dial's algorithm) for integer keys, where the position i of a list contains the stack of paths
+       with the key i. Pushing a path is O(1), and popping one is O(1) plus the number of empty buckets that are
+       skipped, which is small because the keys of the paths to explore are close to each other.
+    """
+    def __init__(self) -> None:
+        """ Constructor. """
+        self._buckets, self._first, self._length = [], 0, 0
+
+    def push(self, key: float, value: Any) -> None:
+        """ Add a path.
+
+        :param key: The path key. It has to be a non-negative integer number, although its type can be float.
+        :param value: The path.
+        :raise ValueError: If the key is not a non-negative integer number.
+        """
+        index = int(key)
+        if index != key or index < 0:
+            raise ValueError(f'The keys of a bucket frontier have to be non-negative integers, not {key}.')
+        if index >= len(self._buckets):
+            self._buckets.extend([] for _ in range(index - len(self._buckets) + 1))
+        self._buckets[index].append((key, value))
+        self._first = min(self._first, index) if self._length else index
+        self._length += 1
+
+    def pop(self) -> Tuple[float, Any]:
+        """ Extract the path with the lowest key.
+
+        :return: A tuple with the key and the path.
+        :raise IndexError: If the frontier is empty.
+        """
+        if not self._length:
+            raise IndexError('pop from an empty frontier')
+        buckets = self._buckets
+        while not buckets[self._first]:
+            self._first += 1
+        self._length -= 1
+        return buckets[self._first].pop()
+
+    def __len__(self) -> int:
+        """
+        :return: The number of paths.
+        """
+        return self._length
+
+
+class HeapFrontier(Frontier):
+    """ A binary heap for any kind of keys. Each path is stored with a decreasing sequence number to extract
+       the last inserted path among the ones with the same key.
+    """
+    def __init__(self) -> None:
+        """ Constructor. """
+        self._heap, self._counter = [], 0
+
+    def push(self, key: float, value: Any) -> None:
+        """ Add a path.
+
+        :param key: The path key.
+        :param value: The path.
+        """
+        self._counter -= 1
+        heappush(self._heap, (key, self._counter, value))
+
+    def pop(self) -> Tuple[float, Any]:
+        """ Extract the path with the lowest key.
+
+        :return: A tuple with the key and the path.
+        :raise IndexError: If the frontier is empty.
+        """
+        key, _, value = heappop(self._heap)
+        return key, value
+
+    def __len__(self) -> int:
+        """
+        :return: The number of paths.
+        """
+        return len(self._heap)
@@ -1,42 +1,133 @@
-from typing import Iterable, Union, Sequence, Hashable, List, Tuple, Callable, Optional
+import asyncio
+from array import array
+from concurrent.futures import Executor
+from threading import Event
+from time import monotonic, perf_counter
+from typing import Any, Iterable, Iterator, Generator, Union, Sequence, Hashable, List, Tuple, Callable, Optional
 import networkx as nx
-from multiprocessing import cpu_count
+from functools import partial
+from operator import itemgetter
+from heapq import heappush, heapreplace
+from multiprocessing import cpu_count, get_all_start_methods, get_context
+from os import path
+from tempfile import TemporaryDirectory
 
 from mysutils.method import synchronized
-from networkx.classes.reportviews import NodeView
 
-from grapheditdistance import INIT_NODE, FINAL_NODE
-from grapheditdistance.base import BaseGraph, NEIGHBORS, VALUE
-from multivaluedbtree import MultivaluedBTree
-from grapheditdistance.distances import EditDistance, Levenshtein
+from grapheditdistance import INIT_NODE, FINAL_NODE, BEST_FIRST, ROWS, AUTOMATON, rows, automaton, persistence
+from grapheditdistance.consts import TOLERANCE
+from grapheditdistance.base import BaseGraph
+from grapheditdistance.cache import SearchCache
+from grapheditdistance.encoding import EncodedEntity
+from grapheditdistance.frontier import Frontier, BucketFrontier, HeapFrontier
+from grapheditdistance.results import SearchResult, SearchResults
+from grapheditdistance.stats import SearchStats, InstrumentedFrontier
+from grapheditdistance.trie import Trie, FrozenTrie, NO_NODE
+from grapheditdistance.distances import EditDistance, Levenshtein, DamerauLevenshtein
 import matplotlib.pyplot as plt
 
-from grapheditdistance.operators import Operator
+from grapheditdistance.operators import Operator, OperatorChain
 
 
 class Graph(BaseGraph):
     """ A graph specially suited to calculate edition distances. """
     @property
-    def nodes(self) -> NodeView:
+    def nodes(self) -> range:
         """
         :return: The graph nodes.
         """
-        return self._g.nodes
+        return self._trie.nodes
 
-    def __init__(self, distance: EditDistance = Levenshtein(), processors: int = 0) -> None:
+    @property
+    def frozen(self) -> bool:
+        """
+        :return: True if this graph is frozen and cannot be modified, otherwise False.
+        """
+        return isinstance(self._trie, FrozenTrie)
+
+    @property
+    def minimized(self) -> bool:
+        """
+        :return: True if this graph was minimized when it was frozen, therefore, its entities share their suffixes.
+        """
+        return self._minimized
+
+    @property
+    def cache(self) -> Optional[SearchCache]:
+        """
+        :return: The cache of search results, with its hit and miss counters, or None if the cache is disabled.
+        """
+        return self._cache
+
+    def __init__(self,
+                 distance: EditDistance = Levenshtein(),
+                 processors: int = 0,
+                 cache_size: int = 0,
+                 cache_ttl: float = None) -> None:
         """ Constructor of this edition distance graph.
 
         :param distance: The algorithm to obtain the operators to apply in each node.
-        :param processors: The limit of CPU processors to use in a parallel search. 0 to use all the CPUs.
+        :param processors: The limit of CPU processors to use in search_many(). 0 to use all the CPUs.
+        :param cache_size: The maximum number of search results to cache. By default, 0, the cache is disabled.
+        :param cache_ttl: The time to live in seconds of each cached result. By default, they do not expire.
         """
-        # Create the empty graph and add the init and end node
-        self._g = nx.MultiDiGraph()
-        self._g.add_node(INIT_NODE, **{NEIGHBORS: {}})
-        self._g.add_node(FINAL_NODE, **{NEIGHBORS: {}})
+        # Create the empty graph with the init node. The final node is implicit.
+        self._trie = Trie()
         # Set the rest of the object attributes
         self._processors = processors if processors else cpu_count()
         self.distance = distance
-        self._entities = {}
+        self._minimized = False
+        self._cache = SearchCache(cache_size, cache_ttl) if cache_size else None
+        self._search_hooks = []
+
+    def add_search_hook(self, hook: Callable[[Sequence[Hashable], SearchStats], None]) -> None:
+        """ Add a function which is called after each search() or search_async() with the searched entity and
+           the search statistics, for example, to export them to a metrics system or to log the slowest queries.
+           While there are hooks, the statistics of all the searches are collected.
+
+        :param hook: The function.
+        """
+        self._search_hooks.append(hook)
+
+    def remove_search_hook(self, hook: Callable[[Sequence[Hashable], SearchStats], None]) -> None:
+        """ Remove a search hook.
+
+        :param hook: The function added with add_search_hook().
+        :raise ValueError: If the hook was not added.
+        """
+        self._search_hooks.remove(hook)
+
+    def neighbors(self, node: int) -> dict:
+        """ The following neighbors of that node.
+        :param node: The node id.
+        :return: A dictionary with the neighbors.
+        """
+        return {self._trie.value(child): child for child in self._trie.children(node)} if node != FINAL_NODE else {}
+
+    def get_neighbor(self, value: Hashable, node: int, default: int = None) -> int:
+        """ Get a given neighbor with a given value.
+
+        :param value: The value to search.
+        :param node: The node to search the neighbor
+        :param default: The default value if the value is not in the node neighbors.
+        :return: The neighbor node id.
+        """
+        symbol = self._trie.symbol_id(value)
+        neighbor = self._trie.child(node, symbol) if symbol != NO_NODE and node != FINAL_NODE else NO_NODE
+        return default if neighbor == NO_NODE else neighbor
+
+    def set_neighbor(self, prev_node: int, node: int, value: Hashable) -> None:
+        """ Set a neighbor to this node.
+
+        :param prev_node: The previous node.
+        :param node: The current node.
+        :param value: The value of the node. It has to be the same value that the node was created with.
+        """
+        self.__check_not_frozen()
+        if self.value(node) != value:
+            raise ValueError(f'The node {node} has the value {self.value(node)}, not {value}.')
+        self.__clear_cache()
+        self._trie.link(prev_node, node)
 
     def _add_node(self, value: Hashable, prev_node: int, pos: int, entity: Sequence) -> int:
         """ Create a node and create the edge from the previous node.
@@ -48,20 +139,12 @@ class Graph(BaseGraph):
         :param entity: The entity that is adding.
         :return: The id of new node or the reuse one.
         """
-        neighbors = self.neighbors(prev_node)
-        if value in neighbors:
-            node = neighbors[value]
-        else:
+        node = self._trie.child(prev_node, self._trie.intern(value))
+        if node == NO_NODE:
             node = self.__create_node(value, prev_node)
             self._add_edge(prev_node, node, pos, entity)
         return node
 
-    def __next_node_id(self) -> int:
-        """ Calculate a new node id.
-        :return: A unique node id.
-        """
-        return len(self._g) - 1
-
     @synchronized
     def __create_node(self, value: Hashable, prev_node: int) -> int:
         """ Create a new node with a unique id.
@@ -70,10 +153,7 @@ class Graph(BaseGraph):
         :param prev_node: The previous node.
         :return: The id of the created node.
         """
-        node = self.__next_node_id()
-        self._g.add_node(node, **{VALUE: value, NEIGHBORS: {}})
-        self.set_neighbor(prev_node, node, value)
-        return node
+        return self._trie.add_child(prev_node, self._trie.intern(value))
 
     def _add_edge(self, prev_node: int, next_node: int, pos: int, entity: Sequence) -> None:
         """ Add an edge in the graph.
@@ -85,42 +165,236 @@ class Graph(BaseGraph):
         """
         prev_value = entity[pos - 1] if pos > 0 else INIT_NODE
         curr_value = entity[pos] if pos < len(entity) else FINAL_NODE
-        for key, weight in self.distance.weights(prev_value, curr_value, pos, entity):
-            self._g.add_edge(prev_node, next_node, key=key, weight=weight)
+        weights = self.distance.weights(prev_value, curr_value, pos, entity)
+        if next_node == FINAL_NODE:
+            self._trie.set_final(prev_node, weights)
+        else:
+            self._trie.set_weights(next_node, weights)
 
-    def add(self, entity: Sequence[Hashable]) -> None:
+    def add(self, entity: Sequence[Hashable], payload: Any = None) -> None:
         """  Add to the graph an entity, which each element of the entity will be a node in the graph.
 
         :param entity: The entity to add.
+        :param payload: Any object to store with the entity, like its id, its canonical form or its frequency,
+           which is returned with the search results of this entity. If None, the previous payload is kept.
         """
+        self.__check_not_frozen()
+        self.__clear_cache()
         if entity:
-            node = INIT_NODE
+            nodes = [INIT_NODE]
             for i, c in enumerate(entity):
-                node = self._add_node(c, node, i, entity)
-            self._add_edge(node, FINAL_NODE, len(entity), entity)
+                nodes.append(self._add_node(c, nodes[-1], i, entity))
+            self._add_edge(nodes[-1], FINAL_NODE, len(entity), entity)
+            self._trie.add_path(nodes)
+            if payload is not None:
+                self._trie.set_payload(nodes[-1], payload)
+
+    def remove(self, entity: Sequence[Hashable]) -> None:
+        """ Remove an entity from the graph, with its payload. The nodes which are not part of other entities are
+           deleted, and their ids are reused. Only the nodes of the entity and their children are visited.
+
+        :param entity: The entity to remove.
+        :raise KeyError: If the entity is not in the graph.
+        """
+        self.__check_not_frozen()
+        nodes = [INIT_NODE]
+        for element in entity:
+            nodes.append(self.get_neighbor(element, nodes[-1], NO_NODE))
+            if nodes[-1] == NO_NODE:
+                break
+        if len(nodes) == 1 or nodes[-1] == NO_NODE or not self._trie.is_final(nodes[-1]):
+            raise KeyError(f'The entity {entity!r} is not in the graph.')
+        self.__clear_cache()
+        self._trie.remove(nodes)
+
+    def index(self,
+              entities: Iterable[Sequence[Hashable]],
+              processors: int = 1,
+              payloads: Iterable[Any] = None) -> None:
+        """ Index several entities in bulk. The resulting graph is identical to adding them one by one with add(),
+           with the same node ids, but it is built faster: each entity reuses the path of the previous one, and
+           while the entities are sorted, the nodes after the common prefix are created without searching them.
+           With several processes, the entities are grouped by their first element, each group is built
+           in a different process, and the parts are merged in one pass.
+
+        :param entities: Any iterable of entities, sorted or not.
+        :param processors: The number of processes. By default, 1. Only one is used if the graph is not empty.
+        :param payloads: The payload of each entity, in the same order as the entities. By default, they do not
+           have payloads.
+        """
+        self.__check_not_frozen()
+        self.__clear_cache()
+        items = zip(entities, payloads) if payloads is not None else ((entity, None) for entity in entities)
+        if processors <= 1 or len(self._trie) > 1:
+            self._index(items)
+            return
+        groups = {}
+        for i, (entity, payload) in enumerate(items):
+            if entity:
+                indexes, group = groups.setdefault(entity[0], ([], []))
+                indexes.append(i)
+                group.append((entity, payload))
+        if len(groups) <= 1:
+            for _, group in groups.values():
+                self._index(group)
+            return
+        processors = min(processors, len(groups))
+        build = partial(_index_in_process, type(self), self.distance)
+        context = get_context('fork') if 'fork' in get_all_start_methods() else get_context()
+        with context.Pool(processors) as pool:
+            parts = pool.map(build, groups.values(), max(1, len(groups) // (processors * 4)))
+        self._trie = Trie.merge(parts)
+
+    def _index(self,
+               items: Iterable[Tuple[Sequence[Hashable], Any]],
+               indexes: Sequence[int] = None) -> Optional[tuple]:
+        """ Add several entities without locking, creating their nodes and edges in the same order as add().
+
+        :param items: Tuples with the entities to add and their payloads.
+        :param indexes: The global position of each entity if this is a part of a parallel build, otherwise None.
+        :return: If indexes is given, the records to merge this part with Trie.merge(): the global position of
+           the entity that created each node and its depth, and the first use of each symbol and weight tuple,
+           as a (position, depth) pair. Otherwise, None.
+        """
+        trie = self._trie
+        created_by, depths, symbol_keys, weight_keys = array('q'), array('i'), {}, {}
+        # While the entities are sorted, the nodes after the common prefix with the previous entity are new
+        ordered, path, previous = len(trie) == 1, [INIT_NODE], ()
+        for n, (entity, payload) in enumerate(items):
+            if not entity:
+                continue
+            common, length = 0, min(len(previous), len(entity))
+            while common < length and previous[common] == entity[common]:
+                common += 1
+            if ordered and common < length:
+                ordered = _precedes(previous[common], entity[common])
+            elif common == len(entity) < len(previous):
+                ordered = False
+            del path[common + 1:]
+            for pos in range(common, len(entity)):
+                symbols, weights = len(trie.symbols), len(trie.weight_table)
+                symbol = trie.intern(entity[pos])
+                node = NO_NODE if ordered else trie.child(path[-1], symbol)
+                if node == NO_NODE:
+                    node = trie.add_child(path[-1], symbol)
+                    self._add_edge(path[-1], node, pos, entity)
+                    if indexes is not None:
+                        created_by.append(indexes[n])
+                        depths.append(pos + 1)
+                if indexes is not None:
+                    if len(trie.symbols) > symbols:
+                        symbol_keys[entity[pos]] = indexes[n], pos + 1
+                    if len(trie.weight_table) > weights:
+                        weight_keys[trie.weight_table[-1]] = indexes[n], pos + 1
+                path.append(node)
+            weights = len(trie.weight_table)
+            self._add_edge(path[-1], FINAL_NODE, len(entity), entity)
+            if indexes is not None and len(trie.weight_table) > weights:
+                weight_keys[trie.weight_table[-1]] = indexes[n], len(entity) + 1
+            trie.add_path(path)
+            if payload is not None:
+                trie.set_payload(path[-1], payload)
+            previous = entity
+        return (trie, created_by, depths, symbol_keys, weight_keys) if indexes is not None else None
+
+    def freeze(self, minimize: bool = False) -> 'Graph':
+        """ Convert this graph in an immutable one, which is faster to search and can be shared among threads
+           without locks. The node ids change, and after freezing, the graph cannot be modified anymore.
+
+        :param minimize: If True, the equivalent suffixes of the entities are merged, like in a DAWG, which needs
+           much less memory. The search results are the same, but the search is slower with dominance,
+           because the paths to the same node with different prefixes are different states.
+           It is ignored if the graph is already frozen.
+        :return: This graph.
+        """
+        if not self.frozen:
+            self._trie = self._trie.freeze(minimize)
+            self._minimized = minimize
+        return self
+
+    def save(self, path: str) -> None:
+        """ Save this graph in a binary file, including its edit distance. If the graph is not frozen,
+           a frozen copy is saved.
+
+        :param path: The file path.
+        """
+        trie = self._trie if self.frozen else self._trie.freeze()
+        header = {'distance': self.distance, 'symbols': trie.symbols, 'weight_table': trie.weight_table,
+                  'payloads': trie.payloads, 'minimized': self._minimized}
+        persistence.save(path, header, trie.arrays)
+
+    @classmethod
+    def load(cls, path: str, mmap: bool = True, **kwargs) -> 'Graph':
+        """ Load a graph saved with the save() method. The loaded graph is frozen.
+           Only load files from trusted sources, because part of the file is unpickled.
+
+        :param path: The file path.
+        :param mmap: If True, the graph arrays are not copied into memory but memory-mapped. Then, several processes
+           that load the same file share its content through the page cache.
+        :param kwargs: Other parameters for the graph constructor, like processors or cache_size.
+        :return: The loaded graph.
+        """
+        header, arrays = persistence.load(path, mmap)
+        graph = cls(distance=header['distance'], **kwargs)
+        graph._trie = FrozenTrie(header['symbols'], header['weight_table'], payloads=header.get('payloads'), **arrays)
+        graph._minimized = header.get('minimized', False)
+        return graph
+
+    def __clear_cache(self) -> None:
+        """ Remove the cached search results, because the graph has changed. """
+        if self._cache is not None:
+            self._cache.clear()
+
+    def __check_not_frozen(self) -> None:
+        """ Check if this graph can be modified.
+
+        :raise RuntimeError: If the graph is frozen.
+        """
+        if self.frozen:
+            raise RuntimeError('This graph is frozen and cannot be modified.')
 
     def draw(self, edge_labels: bool = False) -> None:
         """  Draw this graph.
 
         :param edge_labels: True if the edge labels is shown, otherwise False.
         """
-        node_labels = {x: self.value(x) for x in self.nodes}
-        node_labels = {x: x.replace('_', '') if x in ['_^_', '_$_'] else x for x in node_labels}
-        pos = nx.spring_layout(self._g)
-        nx.draw(self._g, pos, with_labels=True, labels=node_labels, font_color='white')
+        g = self.to_networkx()
+        node_labels = {x: self.value(x) for x in g.nodes}
+        node_labels = {x: label.replace('_', '') if label in ['_^_', '_$_'] else label
+                       for x, label in node_labels.items()}
+        pos = nx.spring_layout(g)
+        nx.draw(g, pos, with_labels=True, labels=node_labels, font_color='white')
         if edge_labels:
-            nx.draw_networkx_edge_labels(self._g, pos, edge_labels=self.__edge_labels(), font_color='red')
+            nx.draw_networkx_edge_labels(g, pos, edge_labels=self.__edge_labels(g), font_color='red')
         plt.plot()
 
-    def __edge_labels(self) -> dict:
+    def to_networkx(self) -> nx.MultiDiGraph:
+        """ Convert this graph to a networkx graph, where each edge weight is an edge with its key.
+
+        :return: A networkx multi-directed graph.
+        """
+        g = nx.MultiDiGraph()
+        g.add_nodes_from(self.nodes)
+        g.add_node(FINAL_NODE)
+        for node in self.nodes:
+            for child in self._trie.children(node):
+                for key, weight in self._trie.weights(child):
+                    g.add_edge(node, child, key=key, weight=weight)
+            for key, weight in self._trie.final_weights(node):
+                g.add_edge(node, FINAL_NODE, key=key, weight=weight)
+        return g
+
+    @staticmethod
+    def __edge_labels(g: nx.MultiDiGraph) -> dict:
         """ Generate a dict that represents the edge labels.
 
+        :param g: The networkx representation of this graph.
         :return: A dict with the edge label representation.
         """
         edge_labels = {}
-        for u_node, v_node, att in self._g.edges:
+        for u_node, v_node, att in g.edges:
             atts = edge_labels[(u_node, v_node)] if (u_node, v_node) in edge_labels else []
-            atts.append(self._g.edges[u_node, v_node, att]['weight'])
+            atts.append(g.edges[u_node, v_node, att]['weight'])
             edge_labels[(u_node, v_node)] = atts
         return edge_labels
 
@@ -130,7 +404,11 @@ class Graph(BaseGraph):
         :param node: The current node.
         :return: A list of integers with the list of adjacent node ids.
         """
-        return self._g[node]
+        if node == FINAL_NODE:
+            return []
+        adjacent = [FINAL_NODE] if self._trie.is_final(node) else []
+        adjacent.extend(self._trie.children(node))
+        return adjacent
 
     def value(self, node: int) -> Hashable:
         """ A node value.
@@ -138,118 +416,611 @@ class Graph(BaseGraph):
         :param node: The node to get its value.
         :return: The value that represents the node.
         """
-        return self.nodes[node].get('value', '_^_' if node == INIT_NODE else '_$_')
+        if node == FINAL_NODE:
+            return '_$_'
+        return self._trie.value(node) if node != INIT_NODE else '_^_'
 
-    def search(self, entity: Sequence[Hashable], threshold: float = 0.8, nbest: int = 1) -> List[tuple]:
+    def encode(self, entity: Sequence[Hashable]) -> List[int]:
+        """ Encode an entity with the compact integer alphabet of this graph, where each different element of the
+           indexed entities has a symbol id.
+
+        :param entity: The entity.
+        :return: The symbol id of each element, or -1 if the element is not in any indexed entity.
+        """
+        symbol_ids = self._trie.symbol_id
+        return [symbol_ids(element) for element in entity]
+
+    def decode(self, symbols: Sequence[int]) -> Sequence:
+        """ Decode an entity encoded with encode().
+
+        :param symbols: The symbol ids. They cannot be -1.
+        :return: The entity, for example, a string in a TextGraph.
+        """
+        table = self._trie.symbols
+        return self._resolve_path([table[symbol] for symbol in symbols])
+
+    def search(self,
+               entity: Sequence[Hashable],
+               threshold: float = 0.8,
+               nbest: int = 1,
+               dominance: bool = False,
+               engine: str = BEST_FIRST,
+               heuristic: bool = False,
+               max_expansions: int = 0,
+               deadline: float = None,
+               stats: bool = False) -> SearchResults:
         """ Sequential search.
 
         :param entity: The entity to search.
         :param threshold: The edit distance threshold with respect to the length of the entity.
         :param nbest: The number of best results. If 0, then return all the results that exceed the threshold.
+        :param dominance: If True, only the cheapest path that arrives to each search state is explored.
+           A state is the position in the entity, the node and the distance state of the used operators
+           (see EditDistance.state()). Therefore, costlier alternative edit operations to obtain the same entity are
+           discarded. By default, False, and all the different sequences of operators are explored.
+           This parameter only affects to the best-first engine.
+        :param engine: The search engine. BEST_FIRST (by default) explores the paths in order of edition distance.
+           ROWS walks the graph in depth calculating a Levenshtein row for each node, and returns the best
+           list of operators for each found entity. The ROWS engine needs a Levenshtein distance.
+           AUTOMATON returns the same results as ROWS, but it walks the graph together with a Levenshtein automaton
+           of the entity, which is much faster for small edit budgets, like 1 or 2 edits. It needs a plain
+           Levenshtein distance with the same cost for all the operations.
+        :param heuristic: If True, the best-first engine explores the paths in order of their edition distance plus
+           an estimation of their remaining cost (A* search), which is obtained from the suffix lengths below each node
+           and the minimum insertion and deletion costs of the distance. Then, the first results are found after
+           exploring fewer paths. By default, False, and the paths are explored only by their edition distance.
+           In both cases, the paths whose estimated cost exceeds the threshold limit are pruned.
+        :param max_expansions: The maximum number of paths to explore with the best-first engine.
+           By default, 0, without limit.
+        :param deadline: The time, as given by time.monotonic(), when the best-first search has to stop.
+           By default, there is not any time limit. If some budget runs out, the best results found so far are
+           returned, but they are marked as incomplete and they are not cached.
+        :param stats: If True, collect the search statistics (see SearchStats) in the attribute "stats" of the
+           results. By default, False, unless there are search hooks, and then, the attribute is None.
         :return: A list of tuples with the original entity, the found entity, the edition distance value,
-           and the list of applied operators.
+           and the list of applied operators, sorted by edition distance. With nbest, they are the cheapest ones.
+           Its attribute "complete" is False if the search was stopped because of its budget.
+        """
+        self.__check_engine(engine)
+        if engine != BEST_FIRST and (max_expansions or deadline is not None):
+            raise ValueError(f'The search budgets can only be used with the engine "{BEST_FIRST}".')
+        search_stats = SearchStats(engine) if stats or self._search_hooks else None
+        start = perf_counter()
+        key = self.__cache_key(entity, threshold, nbest, dominance, engine, heuristic) \
+            if self._cache is not None else None
+        results = self._cache.get(key) if key is not None else None
+        if results is not None:
+            results = SearchResults(results)
+            if search_stats is not None:
+                search_stats.cached = True
+        else:
+            results = self._search(entity, threshold, nbest, dominance, engine, heuristic, max_expansions, deadline,
+                                   search_stats)
+            if key is not None and results.complete:
+                self._cache.put(key, results)
+                results = SearchResults(results)
+        if search_stats is not None:
+            self.__finish_stats(entity, results, search_stats, start)
+        return results
+
+    def __finish_stats(self,
+                       entity: Sequence[Hashable],
+                       results: SearchResults,
+                       stats: SearchStats,
+                       start: float) -> None:
+        """ Complete the statistics of a finished search, attach them to its results and call the search hooks.
+
+        :param entity: The searched entity.
+        :param results: The search results.
+        :param stats: The statistics of the search.
+        :param start: The time, as given by time.perf_counter(), when the search started.
+        """
+        stats.total_seconds = perf_counter() - start
+        stats.results, stats.complete = len(results), results.complete
+        results.stats = stats
+        for hook in self._search_hooks:
+            hook(entity, stats)
+
+    def _search(self,
+                entity: Sequence[Hashable],
+                threshold: float,
+                nbest: int,
+                dominance: bool,
+                engine: str,
+                heuristic: bool = False,
+                max_expansions: int = 0,
+                deadline: float = None,
+                stats: SearchStats = None) -> SearchResults:
+        """ Search an entity with a given engine, without using the cache.
+
+        :param entity: The entity to search.
+        :param threshold: The edit distance threshold with respect to the length of the entity.
+        :param nbest: The number of best results. If 0, then return all the results that exceed the threshold.
+        :param dominance: If True, only the cheapest path that arrives to each search state is explored.
+        :param engine: The search engine.
+        :param heuristic: If True, the best-first engine explores the paths in order of their estimated total cost.
+        :param max_expansions: The maximum number of paths to explore with the best-first engine, 0 without limit.
+        :param deadline: The time, as given by time.monotonic(), when the best-first search has to stop.
+        :param stats: The statistics to update, or None to not collect them.
+        :return: A list of tuples with the found entity, the edition distance value, and the list of applied operators.
+        """
+        if engine == ROWS:
+            return SearchResults(rows.search(self, entity, threshold, nbest, stats))
+        if engine == AUTOMATON:
+            return SearchResults(automaton.search(self, entity, threshold, nbest, stats))
+        return self._best_first_search(entity, threshold, nbest, dominance, heuristic, max_expansions, deadline,
+                                       stats)
+
+    def iter_search(self,
+                    entity: Sequence[Hashable],
+                    threshold: float = 0.8,
+                    nbest: int = 0,
+                    dominance: bool = False,
+                    heuristic: bool = False) -> Iterator[tuple]:
+        """ Search an entity with the best-first engine, generating the results as soon as they are found.
+           The results are generated in non-decreasing order of edition distance, therefore, the first results
+           are available before the search finishes, and the search stops when the generator is not consumed anymore.
+           The cache is not used.
+
+        :param entity: The entity to search.
+        :param threshold: The edit distance threshold with respect to the length of the entity.
+        :param nbest: The number of best results. By default, 0, all the results that exceed the threshold.
+        :param dominance: If True, only the cheapest path that arrives to each search state is explored.
+        :param heuristic: If True, explore the paths in order of edition distance plus their estimated remaining cost.
+        :return: A generator of tuples with the found entity, the edition distance value, and the list of applied
+           operators, like the search() results.
         """
-        paths = MultivaluedBTree()
+        return self._iter_best_first_search(entity, threshold, nbest, dominance, heuristic)
+
+    async def search_async(self,
+                           entity: Sequence[Hashable],
+                           threshold: float = 0.8,
+                           nbest: int = 1,
+                           dominance: bool = False,
+                           engine: str = BEST_FIRST,
+                           heuristic: bool = False,
+                           yield_every: int = 100,
+                           timeout: float = None,
+                           executor: Executor = None,
+                           stats: bool = False) -> SearchResults:
+        """ Search an entity without blocking the asyncio event loop. The search gives the control back to the event
+           loop every yield_every explored paths, therefore, the task can be cancelled and other tasks can run
+           meanwhile. Optionally, the search runs in an executor, and then, it stops at the same points if the task
+           is cancelled or the timeout expires. The ROWS and AUTOMATON engines only stop or give the control back
+           in an executor.
+
+        :param entity: The entity to search.
+        :param threshold: The edit distance threshold with respect to the length of the entity.
+        :param nbest: The number of best results. If 0, then return all the results that exceed the threshold.
+        :param dominance: If True, only the cheapest path that arrives to each search state is explored.
+        :param engine: The search engine, BEST_FIRST, ROWS or AUTOMATON.
+        :param heuristic: If True, explore the paths in order of edition distance plus their estimated remaining cost.
+        :param yield_every: The number of explored paths between two points where the search can be interrupted.
+        :param timeout: The maximum time in seconds to search. By default, there is not any time limit.
+        :param executor: The executor to run the search, for example, a ThreadPoolExecutor shared by several
+           searches. By default, the search runs in the event loop.
+        :param stats: If True, collect the search statistics in the attribute "stats" of the results, like search().
+           The search hooks are called when the search finishes, but not if it is cancelled or it times out.
+        :return: The same results as search().
+        :raise asyncio.TimeoutError: If the timeout expires before the search finishes.
+        """
+        self.__check_engine(engine)
+        search_stats = SearchStats(engine) if stats or self._search_hooks else None
+        start = perf_counter()
+        key = self.__cache_key(entity, threshold, nbest, dominance, engine, heuristic)
+        results = self._cache.get(key) if self._cache is not None else None
+        if results is not None:
+            results = SearchResults(results)
+            if search_stats is not None:
+                search_stats.cached = True
+                self.__finish_stats(entity, results, search_stats, start)
+            return results
+        loop = asyncio.get_running_loop()
+        steps = self._search_steps(entity, threshold, nbest, dominance, engine, heuristic, yield_every, search_stats)
+        if executor is None:
+            end = loop.time() + timeout if timeout is not None else None
+            results = []
+            try:
+                for result in steps:
+                    if result is not None:
+                        results.append(result)
+                    elif end is not None and loop.time() >= end:
+                        raise asyncio.TimeoutError(f'The search of {entity} has exceeded the timeout of {timeout} s.')
+                    else:
+                        await asyncio.sleep(0)
+            finally:
+                steps.close()
+        else:
+            stop = Event()
+            try:
+                results = await asyncio.wait_for(loop.run_in_executor(executor, _collect_steps, steps, stop), timeout)
+            except BaseException:
+                # Stop the search in the executor if the task is cancelled or the timeout expires
+                stop.set()
+                raise
+        if self._cache is not None:
+            self._cache.put(key, results)
+        results = SearchResults(results)
+        if search_stats is not None:
+            self.__finish_stats(entity, results, search_stats, start)
+        return results
+
+    def __cache_key(self,
+                    entity: Sequence[Hashable],
+                    threshold: float,
+                    nbest: int,
+                    dominance: bool,
+                    engine: str,
+                    heuristic: bool) -> tuple:
+        """ The key of the cached results of a search.
+
+        :param entity: The entity to search.
+        :param threshold: The edit distance threshold with respect to the length of the entity.
+        :param nbest: The number of best results.
+        :param dominance: If only the cheapest path that arrives to each search state is explored.
+        :param engine: The search engine.
+        :param heuristic: If the paths are explored in order of their estimated total cost.
+        :return: A tuple with the search parameters and the distance configuration.
+        """
+        return tuple(entity), threshold, nbest, dominance, engine, heuristic, self.distance.config
+
+    def _search_steps(self,
+                      entity: Sequence[Hashable],
+                      threshold: float,
+                      nbest: int,
+                      dominance: bool,
+                      engine: str,
+                      heuristic: bool,
+                      pause: int,
+                      stats: SearchStats = None) -> Iterator[Optional[tuple]]:
+        """ Search an entity with a given engine, generating the results and a None every pause explored paths.
+
+        :param entity: The entity to search.
+        :param threshold: The edit distance threshold with respect to the length of the entity.
+        :param nbest: The number of best results. If 0, then return all the results that exceed the threshold.
+        :param dominance: If True, only the cheapest path that arrives to each search state is explored.
+        :param engine: The search engine.
+        :param heuristic: If True, explore the paths in order of edition distance plus their estimated remaining cost.
+        :param pause: The number of explored paths between two None. Only the best-first engine generates them.
+        :param stats: The statistics to update, or None to not collect them.
+        :return: A generator with the search() results and None values.
+        """
+        if engine == ROWS:
+            yield from rows.search(self, entity, threshold, nbest, stats)
+        elif engine == AUTOMATON:
+            yield from automaton.search(self, entity, threshold, nbest, stats)
+        else:
+            yield from self._iter_best_first_search(entity, threshold, nbest, dominance, heuristic, pause, stats=stats)
+
+    def _best_first_search(self,
+                           entity: Sequence[Hashable],
+                           threshold: float,
+                           nbest: int,
+                           dominance: bool,
+                           heuristic: bool = False,
+                           max_expansions: int = 0,
+                           deadline: float = None,
+                           stats: SearchStats = None) -> SearchResults:
+        """ Search an entity exploring the paths in order of edition distance.
+
+        :param entity: The entity to search.
+        :param threshold: The edit distance threshold with respect to the length of the entity.
+        :param nbest: The number of best results. If 0, then return all the results that exceed the threshold.
+        :param dominance: If True, only the cheapest path that arrives to each search state is explored.
+        :param heuristic: If True, explore the paths in order of edition distance plus their estimated remaining cost.
+        :param max_expansions: The maximum number of paths to explore, 0 without limit.
+        :param deadline: The time, as given by time.monotonic(), when the search has to stop.
+        :param stats: The statistics to update, or None to not collect them.
+        :return: A list of tuples with the found entity, the edition distance value, and the list of applied operators.
+        """
+        steps = self._iter_best_first_search(entity, threshold, nbest, dominance, heuristic, 0, max_expansions,
+                                             deadline, stats)
+        results = SearchResults()
+        while True:
+            try:
+                results.append(next(steps))
+            except StopIteration as end:
+                results.complete = end.value
+                return results
+
+    def _iter_best_first_search(self,
+                                entity: Sequence[Hashable],
+                                threshold: float,
+                                nbest: int,
+                                dominance: bool,
+                                heuristic: bool = False,
+                                pause: int = 0,
+                                max_expansions: int = 0,
+                                deadline: float = None,
+                                stats: SearchStats = None) -> Generator[Optional[tuple], None, bool]:
+        """ Search an entity exploring the paths in order of edition distance. The results are returned in
+           non-decreasing order of edition distance, therefore, the nbest first ones are the cheapest.
+           Once nbest candidate results are found, the limit is lowered to the edition distance of the worst of them.
+
+        :param entity: The entity to search.
+        :param threshold: The edit distance threshold with respect to the length of the entity.
+        :param nbest: The number of best results. If 0, then return all the results that exceed the threshold.
+        :param dominance: If True, only the cheapest path that arrives to each search state is explored.
+        :param heuristic: If True, explore the paths in order of edition distance plus their estimated remaining cost.
+        :param pause: If it is greater than 0, generate None every time this number of paths have been explored,
+           to allow the caller to do other tasks or stop the search.
+        :param max_expansions: The maximum number of paths to explore, 0 without limit.
+        :param deadline: The time, as given by time.monotonic(), when the search has to stop.
+        :param stats: The statistics to update, or None to not collect them.
+        :return: A generator of tuples with the found entity, the edition distance value, and the list of applied
+           operators. When a budget runs out, the found results that have not been generated yet are generated in
+           order, although cheaper ones could exist, and the generator returns False. Otherwise, it returns True.
+        """
+        paths = self._frontier()
+        if stats is not None:
+            paths = InstrumentedFrontier(paths, stats)
         visited_paths = {}
-        # Each tuple has the entity to search, the current position in the entity,
-        # the current node, the path to arrive here, and the used operators.
-        paths[0.] = (entity, 0, INIT_NODE, [], [])
+        # Each tuple has the path weight, the entity to search, the current position in the entity,
+        # the current node, and the chain of used operators to arrive here.
+        paths.push(0., (0., entity, 0, INIT_NODE, OperatorChain()))
+        if dominance:
+            visited_paths[self._state(0, INIT_NODE, OperatorChain())] = 0.
         limit = len(entity) * (1 - threshold)
-        results = []
+        # The entity is encoded once to compare it with the symbol summaries of the nodes
+        encoded = EncodedEntity(self.encode(entity))
+        # The lower bounds of the deletion, insertion, and insertion or replacement costs
+        distance = self.distance
+        bounds = distance.min_delete_cost, distance.min_insert_cost, \
+            min(distance.min_insert_cost, distance.min_replace_cost)
+        # The negative weights of the nbest cheapest results found but not explored yet
+        candidates = []
+        # The found results that are postponed until they are explored, with the node where their entity ends,
+        # by the id of their operators
+        postponed = {}
+        found = expansions = 0
         # While I have paths to explore
         while len(paths):
+            if max_expansions and expansions >= max_expansions or deadline is not None and monotonic() >= deadline:
+                # The budget has run out, then generate the best results found so far
+                postponed = sorted(postponed.values(), key=itemgetter(0))
+                for weight, operators, end in postponed[:nbest - found] if nbest else postponed:
+                    yield self._result(operators.path(), weight, operators.to_list(), end)
+                return False
             # Get the parameter of the next path to explore with the less edition distance weight
-            weight, (entity, pos, node, path, operators) = paths.popitem()
-            path_hash = hash(tuple(operators))
-            if path_hash not in visited_paths:
+            key, (weight, entity, pos, node, operators) = paths.pop()
+            # The rest of the paths cannot arrive to a result within the limit
+            if key > limit + TOLERANCE:
+                if stats is not None:
+                    stats.pruned_by_threshold += len(paths) + 1
+                break
+            # The postponed results are added when they are explored, therefore, after all the cheaper paths
+            if node == FINAL_NODE:
+                _, _, end = postponed.pop(id(operators))
+                yield self._result(operators.path(), weight, operators.to_list(), end)
+                found += 1
+                # If nbest is different to 0, and I've achieved the maximum number of results, stop the search.
+                if nbest and found == nbest:
+                    return True
+                continue
+            if dominance:
+                # Discard the path if a cheaper one has already arrived to the same state
+                if weight > visited_paths[self._state(pos, node, operators)]:
+                    if stats is not None:
+                        stats.pruned_by_visited += 1
+                    continue
+            else:
+                path_hash = hash(operators)
+                if path_hash in visited_paths:
+                    if stats is not None:
+                        stats.pruned_by_visited += 1
+                    continue
                 visited_paths[path_hash] = operators
-                # Explore that path and get the next path I can explore
-                next_paths = self._explore_node(weight, entity, pos, node, path, operators)
-                for weight, entity, pos, node, path, operators in next_paths:
-                    # If the final node was archived and all the entity was explored, then add it to the result.
-                    if node == FINAL_NODE and pos == len(entity):
-                        similar_entity = self._resolve_path(path)
-                        results.append((similar_entity, weight, operators))
-                    # Otherwise, add the path if its weight is less than the limited by the threshold
-                    elif weight <= limit:
-                        paths[weight] = (entity, pos, node, path, operators)
-                    # If nbest is different to 0, and I've achieved the maximum number of results, return the results.
-                    if nbest and len(results) == nbest:
-                        return results
-        return results
+            expansions += 1
+            if pause and not expansions % pause:
+                yield None
+            # Explore that path and get the next path I can explore
+            if stats is None:
+                next_paths = self._explore_node(weight, entity, pos, node, operators)
+            else:
+                start = perf_counter()
+                next_paths = self._explore_node(weight, entity, pos, node, operators)
+                stats.costs_seconds += perf_counter() - start
+                stats.expansions += 1
+                stats.candidates += len(next_paths)
+            for weight, entity, pos, next_node, operators in next_paths:
+                if weight > limit:
+                    if stats is not None:
+                        stats.pruned_by_threshold += 1
+                    continue
+                # If the final node was archived and all the entity was explored, then it is a candidate result.
+                if next_node == FINAL_NODE and pos == len(entity):
+                    if nbest:
+                        # Once there are nbest candidates, the limit is the weight of the worst of them
+                        if len(candidates) < nbest:
+                            heappush(candidates, -weight)
+                        else:
+                            heapreplace(candidates, -weight)
+                        if len(candidates) == nbest:
+                            limit = -candidates[0]
+                    # The paths to explore never have a lower key than the current one, then, if the candidate
+                    # is not more expensive, it is a result. Otherwise, it is a result when it is explored.
+                    if weight <= key:
+                        yield self._result(operators.path(), weight, operators.to_list(), node)
+                        found += 1
+                        if nbest and found == nbest:
+                            return True
+                    else:
+                        postponed[id(operators)] = (weight, operators, node)
+                        paths.push(weight, (weight, entity, pos, next_node, operators))
+                    continue
+                # Otherwise, prune the path if it cannot arrive to any entity end within the limit
+                estimation = self._remaining_cost(encoded, pos, next_node, bounds)
+                if weight + estimation > limit + TOLERANCE:
+                    if stats is not None:
+                        stats.pruned_by_threshold += 1
+                    continue
+                if dominance:
+                    state = self._state(pos, next_node, operators)
+                    if visited_paths.get(state, limit + 1) <= weight:
+                        if stats is not None:
+                            stats.pruned_by_visited += 1
+                        continue
+                    visited_paths[state] = weight
+                paths.push(weight + estimation if heuristic else weight, (weight, entity, pos, next_node, operators))
+        return True
+
+    def _frontier(self) -> Frontier:
+        """ Create the priority queue of the paths to explore. If all the operator costs of the distance are integers,
+           the path keys are also integers, then a bucket queue is used. Otherwise, a binary heap.
+
+        :return: An empty frontier.
+        """
+        return BucketFrontier() if self.distance.integer_costs else HeapFrontier()
+
+    def _remaining_cost(self,
+                        encoded: EncodedEntity,
+                        pos: int,
+                        node: int,
+                        bounds: Tuple[float, float, float]) -> float:
+        """ An admissible estimation of the cost to arrive from a node to any entity end below it. The number of
+           insertions minus deletions of any path is the difference between the remaining elements of the searched
+           entity and the suffix length, therefore, if the remaining elements are out of the suffix length range of
+           the node, at least that difference of insertions or deletions are needed. Moreover, each remaining element
+           which is not in the symbol summary of the node has to be inserted or replaced.
+
+        :param encoded: The searched entity encoded with the symbol ids of this graph.
+        :param pos: The current position in the searched entity.
+        :param node: The current node.
+        :param bounds: The lower bounds of the deletion, insertion, and insertion or replacement costs of the distance.
+           A bound is 0 if the distance cannot guarantee it.
+        :return: A lower bound of the remaining cost.
+        """
+        remaining = len(encoded) - pos
+        shortest, longest = self._trie.length_range(node)
+        if remaining < shortest:
+            estimation = (shortest - remaining) * bounds[0]
+        elif remaining > longest:
+            estimation = (remaining - longest) * bounds[1]
+        else:
+            estimation = 0.
+        # The symbol summary only helps if each missing element has a known minimum cost
+        if bounds[2] > 0:
+            missing = encoded.missing(pos, self._trie.symbol_mask(node))
+            if missing:
+                return max(estimation, missing * bounds[2])
+        return estimation
+
+    def __check_engine(self, engine: str) -> None:
+        """ Check if a search engine exists and can be used with the distance of this graph.
 
-    # def search(self, entity: Sequence[Hashable], threshold: float = 0.8, nbest: int = 1) -> List[tuple]:
-    #     """ A parallel search.
-    #
-    #     :param entity: The entity to search.
-    #     :param threshold: The edit distance threshold with respect to the length of the entity.
-    #     :param nbest: The number of best results. If 0, then return all the results that exceed the threshold.
-    #     :return: A list of tuples with the original entity, the found entity, the edition distance value,
-    #        and the list of applied operators.
-    #     """
-    #     # TODO: Parallel search with processes.
-    #     raise NotImplemented('This method is not implemented yet. It will in future versions of this module,')
-    #     paths = MultivaluedBTree()
-    #     visited_paths = {}
-    #     # Each tuple has the entity to search, the current position in the entity,
-    #     # the current node, the path to arrive here, and the used operators.
-    #     paths[0.] = (entity, 0, INIT_NODE, [], [])
-    #     limit = len(entity) * (1 - threshold)
-    #     results = []
-    #     # While I have paths to explore
-    #     while len(paths):
-    #         # Get the parameter of the next path to explore with the less edition distance weight
-    #         weight, (entity, pos, node, path, operators) = paths.popitem()
-    #         path_hash = hash(tuple(operators))
-    #         if path_hash not in visited_paths:
-    #             visited_paths[path_hash] = operators
-    #             self._execute_node(weight, entity, pos, node, path, operators)
-    #             # Explore that path and get the next path I can explore
-    #             next_paths = self._explore_node(weight, entity, pos, node, path, operators)
-    #             for weight, entity, pos, node, path, operators in next_paths:
-    #                 # If the final node was archived and all the entity was explored, then add it to the result.
-    #                 if node == FINAL_NODE and pos == len(entity):
-    #                     similar_entity = self._resolve_path(path)
-    #                     results.append((entity, self._entities.get(similar_entity, similar_entity), weight, operators))
-    #                 # Otherwise, add the path if its weight is less than the limited by the threshold
-    #                 elif weight <= limit:
-    #                     paths[weight] = (entity, pos, node, path, operators)
-    #                 # If nbest is different to 0, and I've achieved the maximum number of results, return the results.
-    #                 if nbest and len(results) == nbest:
-    #                     return results
-    #
-    #     return results
+        :param engine: The search engine.
+        :raise ValueError: If the engine does not exist or cannot be used with this distance.
+        """
+        if engine not in (BEST_FIRST, ROWS, AUTOMATON):
+            raise ValueError(f'Unknown search engine "{engine}". '
+                             f'It should be "{BEST_FIRST}", "{ROWS}" or "{AUTOMATON}".')
+        if engine == ROWS and (not isinstance(self.distance, Levenshtein)
+                               or isinstance(self.distance, DamerauLevenshtein)):
+            raise ValueError(f'The engine "{ROWS}" needs a Levenshtein distance, not {type(self.distance)}.')
+        if engine == AUTOMATON and not automaton.supports(self.distance):
+            raise ValueError(f'The engine "{AUTOMATON}" needs a Levenshtein distance with the same cost for all the '
+                             f'operations, not {type(self.distance)}.')
+
+    def _state(self, pos: int, node: int, operators: List[Operator]) -> tuple:
+        """ The search state of a path, used to discard the paths dominated by other cheaper ones.
+
+        :param pos: The current position in the entity.
+        :param node: The current node.
+        :param operators: The list of operators to arrive at this node.
+        :return: A tuple with the position, the node and the distance state of the operators. In a minimized graph,
+           the same node can be reached from different prefixes, then, the state also includes the prefix.
+        """
+        if self._minimized:
+            return pos, node, self.distance.state(operators), tuple(operators.path())
+        return pos, node, self.distance.state(operators)
+
+    def search_batch(self,
+                     entities: Iterable[Sequence[Hashable]],
+                     threshold: float = 0.8,
+                     nbest: int = 1) -> List[List[tuple]]:
+        """ Search several entities at once, sharing the work of their common prefixes. The entities are indexed in
+           a trie that is walked together with the graph, calculating a Levenshtein row for each node in both.
+           This is much faster than search the entities one by one when many of them share prefixes,
+           but the rows are as long as the number of prefixes, therefore, it is better to search batches of
+           a few hundred or thousand entities. Like the ROWS engine, it needs a Levenshtein distance.
+
+        :param entities: The entities to search.
+        :param threshold: The edit distance threshold with respect to the length of the entity.
+        :param nbest: The number of best results. If 0, then return all the results that exceed the threshold.
+        :return: A list with the results of each entity, in the same order as the entities.
+           The results of each entity are the same as search(entity, threshold, nbest, engine=ROWS).
+        """
+        self.__check_engine(ROWS)
+        return rows.search_batch(self, list(entities), threshold, nbest)
+
+    def search_many(self,
+                    entities: Iterable[Sequence[Hashable]],
+                    threshold: float = 0.8,
+                    nbest: int = 1,
+                    processors: int = None,
+                    **kwargs) -> List[List[tuple]]:
+        """ Search several entities in parallel with a pool of processes.
+           The graph is sent to each process only once: the processes inherit it if they can be forked,
+           otherwise, the graph is saved in a temporary file and each process memory-maps it.
+
+        :param entities: The entities to search.
+        :param threshold: The edit distance threshold with respect to the length of the entity.
+        :param nbest: The number of best results. If 0, then return all the results that exceed the threshold.
+        :param processors: The number of processes. By default, the processors given in the constructor.
+        :param kwargs: Other parameters for the search() method, like dominance or engine.
+        :return: A list with the search() results of each entity, in the same order as the entities.
+        """
+        entities = list(entities)
+        processors = min(processors if processors else self._processors, len(entities))
+        search = partial(_search_in_process, threshold=threshold, nbest=nbest, **kwargs)
+        if processors <= 1:
+            return [self.search(entity, threshold, nbest, **kwargs) for entity in entities]
+        chunk_size = max(1, len(entities) // (processors * 4))
+        if 'fork' in get_all_start_methods():
+            with get_context('fork').Pool(processors, _init_process, (self,)) as pool:
+                return pool.map(search, entities, chunk_size)
+        with TemporaryDirectory() as tmp:
+            file = path.join(tmp, 'graph.bin')
+            self.save(file)
+            with get_context().Pool(processors, _load_in_process, (type(self), file)) as pool:
+                return pool.map(search, entities, chunk_size)
 
     def _explore_node(self,
                       weight: float,
                       entity: Sequence[Hashable],
                       pos: int,
                       node: Union[int, str],
-                      path: List[Hashable],
-                      operators: List[Operator]) -> List[Tuple[float, Sequence, int, int, list, List[Operator]]]:
+                      operators: OperatorChain) -> List[Tuple[float, Sequence, int, int, OperatorChain]]:
         """ Explore the neighbors of a node and return all the possible path to explore.
 
         :param weight: The path weight at the moment.
         :param entity: The entity to search.
         :param pos: The current position of the entity.
         :param node: The current node to get its neighbors.
-        :param path: The current path to arrive at this node.
-        :param operators: The list of operators to arrive at this node.
+        :param operators: The chain of operators to arrive at this node.
         :return: A list of tuples with the parameters of the path to explore in the future.
            Each tuple contains the new weight, the entity, the new position in the entity, the next node id to explore,
-           the path to arrive to that node, and the list of operation to arrive to that node.
+           and the chain of operators to arrive to that node, which shares the previous operators with this one.
         """
         results = []
         for adjacent_node in self.adjacent(node):
             for operator in self.distance.costs(pos, entity, self, node, adjacent_node, operators):
                 new_weight = weight + operator.cost
                 next_pos = pos + operator.increase_pos
-                next_node = operator.next_node
-                new_path = path + operator.operate()
-                new_operators = operators + [operator]
-                results.append((new_weight, entity, next_pos, next_node, new_path, new_operators))
+                results.append((new_weight, entity, next_pos, operator.next_node, operators.append(operator)))
         return results
 
+    def _result(self, path: List[Hashable], weight: float, operators: List[Operator], node: int) -> SearchResult:
+        """ Create a search result.
+
+        :param path: The elements of the found entity.
+        :param weight: The edition distance value.
+        :param operators: The list of applied operators.
+        :param node: The node where the found entity ends.
+        :return: The result with the found entity and its payload.
+        """
+        return SearchResult(self._resolve_path(path), weight, operators, self._trie.payload(node))
+
     def _resolve_path(self, path: List[Hashable]) -> Sequence:
         """  If it is necessary to convert the path to the final user.
 
@@ -268,3 +1039,78 @@ class TextGraph(Graph):
         :return: The string that represents that path. In a TextGraph, this represents the string with the found entity.
         """
         return ''.join(super(TextGraph, self)._resolve_path(path))
+
+
+def _collect_steps(steps: Iterator[Optional[tuple]], stop: Event) -> Optional[List[tuple]]:
+    """ Collect the results of a search generated by Graph._search_steps() in an executor.
+
+    :param steps: The generator of results and None values.
+    :param stop: An event to stop the search at the next None value.
+    :return: The list of results, or None if the search was stopped.
+    """
+    results = []
+    for result in steps:
+        if result is not None:
+            results.append(result)
+        elif stop.is_set():
+            steps.close()
+            return None
+    return results
+
+
+# The graph of each process of the search_many() pool
+_process_graph = None
+
+
+def _init_process(graph: Graph) -> None:
+    """ Initialize a forked process of the search_many() pool with the inherited graph.
+
+    :param graph: The graph to search in.
+    """
+    global _process_graph
+    _process_graph = graph
+
+
+def _index_in_process(cls: type, distance: EditDistance, group: Tuple[List[int], List[tuple]]) -> tuple:
+    """ Build in a process the part of a graph with a group of entities for Graph.index().
+
+    :param cls: The graph class.
+    :param distance: The edit distance of the graph.
+    :param group: A tuple with the global position of each entity of the group, and the entities with
+       their payloads.
+    :return: The trie of the part and its records to merge it.
+    """
+    indexes, items = group
+    return cls(distance, 1)._index(items, indexes)
+
+
+def _precedes(first: Hashable, second: Hashable) -> bool:
+    """ Check if an element is lower than other one.
+
+    :param first: The first element.
+    :param second: The second element.
+    :return: True if the first element is lower, False if it is not or if the elements cannot be compared.
+    """
+    try:
+        return first < second
+    except TypeError:
+        return False
+
+
+def _load_in_process(cls: type, file: str) -> None:
+    """ Initialize a process of the search_many() pool loading the graph from a file.
+
+    :param cls: The graph class.
+    :param file: The file with the saved graph.
+    """
+    _init_process(cls.load(file))
+
+
+def _search_in_process(entity: Sequence[Hashable], **kwargs) -> List[tuple]:
+    """ Search an entity in the graph of this process.
+
+    :param entity: The entity to search.
+    :param kwargs: The parameters of the search() method.
+    :return: The search() results.
+    """
+    return _process_graph.search(entity, **kwargs)
@@ -1 +1,3 @@
-from .base import Operator, NoneOperator, FinalOperator, InsertOperator, DeleteOperator, ReplaceOperator
+from .base import Operator, NoneOperator, FinalOperator, InsertOperator, DeleteOperator, ReplaceOperator, \
+    TransposeOperator
+from .chain import OperatorChain
@@ -7,6 +7,7 @@ from grapheditdistance import FINAL_NODE
 class Operator(ABC):
     """ Abstract operator. """
     __metaclass__ = ABCMeta
+    __slots__ = ('_name', '_cost', '_increase_pos', '_next_node')
 
     @property
     def name(self) -> str:
@@ -62,7 +63,7 @@ class Operator(ABC):
 
         :return: An integer that represents the hash.
         """
-        return hash(str(self))
+        return hash(self._key())
 
     def __eq__(self, other: 'Operator') -> bool:
         """ Compare two operators.
@@ -70,7 +71,15 @@ class Operator(ABC):
         :param other: Other operator.
         :return: True if this the same operator, with the same elements, and the same cost.
         """
-        return str(self) == str(other)
+        return isinstance(other, Operator) and self._key() == other._key()
+
+    def _key(self) -> tuple:
+        """ The key to compare and hash this operator. By default, its string representation, but the subclasses
+           can override it to avoid formatting strings.
+
+        :return: A tuple which is equal for equal operators.
+        """
+        return str(self),
 
     @abstractmethod
     def operate(self) -> List[Any]:
@@ -80,6 +89,8 @@ class Operator(ABC):
 
 class NoneOperator(Operator):
     """ A dummy operator that do nothing. """
+    __slots__ = ('_element',)
+
     @property
     def element(self) -> Any:
         """ The element of the entity to do nothing. """
@@ -98,6 +109,12 @@ class NoneOperator(Operator):
         """ A representation of this operator. """
         return f'({self.name})'
 
+    def _key(self) -> tuple:
+        """
+        :return: A tuple with the operator name, the element and the next node.
+        """
+        return self._name, self._element, self._next_node
+
     def operate(self) -> List[Any]:
         """
         :return: The same element without changes.
@@ -107,6 +124,8 @@ class NoneOperator(Operator):
 
 class FinalOperator(Operator):
     """ An operator to indicate that this is the last. """
+    __slots__ = ()
+
     def __init__(self) -> None:
         """ Constructor. """
         super().__init__('Final', 0, 0, FINAL_NODE)
@@ -115,6 +134,12 @@ class FinalOperator(Operator):
         """ A representation of this operator. """
         return f'({self.name})'
 
+    def _key(self) -> tuple:
+        """
+        :return: A tuple with the operator name.
+        """
+        return self._name,
+
     def operate(self) -> List[Any]:
         """
         :return: The empty element.
@@ -124,6 +149,8 @@ class FinalOperator(Operator):
 
 class InsertOperator(Operator):
     """ The insert operation. """
+    __slots__ = ('_element',)
+
     @property
     def inserted_element(self) -> Any:
         """
@@ -144,6 +171,12 @@ class InsertOperator(Operator):
         """ A representation of this operator. """
         return f'({self.name}[{self.inserted_element}], {self.cost})'
 
+    def _key(self) -> tuple:
+        """
+        :return: A tuple with the operator name, the element, the cost and the next node.
+        """
+        return self._name, self._element, self._cost, self._next_node
+
     def operate(self) -> List[Any]:
         """
         :return: An empty entity because it is necessary to remove the inserted element.
@@ -153,6 +186,8 @@ class InsertOperator(Operator):
 
 class DeleteOperator(Operator):
     """ The delete operation. """
+    __slots__ = ('_element',)
+
     @property
     def deleted_element(self) -> Any:
         """
@@ -173,6 +208,12 @@ class DeleteOperator(Operator):
         """ A representation of this operator. """
         return f'({self.name}[{self.deleted_element}], {self.cost})'
 
+    def _key(self) -> tuple:
+        """
+        :return: A tuple with the operator name, the element, the cost and the next node.
+        """
+        return self._name, self._element, self._cost, self._next_node
+
     def operate(self) -> List[Any]:
         """
         :return: The deleted element.
@@ -182,6 +223,8 @@ class DeleteOperator(Operator):
 
 class ReplaceOperator(Operator):
     """ The replace operation. """
+    __slots__ = ('_from_element', '_to_element')
+
     @property
     def from_element(self) -> Any:
         """
@@ -211,8 +254,61 @@ class ReplaceOperator(Operator):
         """ A representation of this operator. """
         return f'({self.name}[{self.from_element} -> {self.to_element}], {self.cost})'
 
+    def _key(self) -> tuple:
+        """
+        :return: A tuple with the operator name, the elements, the cost and the next node.
+        """
+        return self._name, self._from_element, self._to_element, self._cost, self._next_node
+
     def operate(self) -> List[Any]:
         """
         :return: the element which is necessary to replace with.
         """
         return [self.to_element]
+
+
+class TransposeOperator(Operator):
+    """ The transposition of two adjacent elements, which consumes two elements of the entity and two graph edges. """
+    __slots__ = ('_first_element', '_second_element')
+
+    @property
+    def first_element(self) -> Any:
+        """
+        :return: The first transposed element of the entity, which is the second one in the graph.
+        """
+        return self._first_element
+
+    @property
+    def second_element(self) -> Any:
+        """
+        :return: The second transposed element of the entity, which is the first one in the graph.
+        """
+        return self._second_element
+
+    def __init__(self, cost: float, first_element: Any, second_element: Any, next_node: int) -> None:
+        """ Constructor.
+        :param cost: The transposition cost.
+        :param first_element: The first element of the entity to transpose.
+        :param second_element: The second element of the entity to transpose.
+        :param next_node: The node after the two graph edges.
+        """
+        super().__init__('transpose', cost, 2, next_node)
+        self._first_element = first_element
+        self._second_element = second_element
+
+    def __repr__(self) -> str:
+        """ A representation of this operator. """
+        return f'({self.name}[{self.first_element}{self.second_element} -> {self.second_element}{self.first_element}]' \
+               f', {self.cost})'
+
+    def _key(self) -> tuple:
+        """
+        :return: A tuple with the operator name, the elements, the cost and the next node.
+        """
+        return self._name, self._first_element, self._second_element, self._cost, self._next_node
+
+    def operate(self) -> List[Any]:
+        """
+        :return: The two elements in the graph order.
+        """
+        return [self._second_element, self._first_element]
@@ -0,0 +1,107 @@
+from collections.abc import Sequence
+from typing import Any, List, Iterator, Union
+
+from grapheditdistance.operators.base import Operator
+
+
+class OperatorChain(Sequence):
+    """ An immutable list of operators, where each chain only stores its last operator and a link to the chain with
+       the previous ones. Therefore, adding an operator to a chain does not copy it, and the different paths of a
+       search share their common operators. The empty chain has no operator and no previous chain.
+    """
+    __slots__ = ('_operator', '_previous', '_length', '_hash')
+
+    @property
+    def operator(self) -> Operator:
+        """
+        :return: The last operator of this chain.
+        """
+        return self._operator
+
+    @property
+    def previous(self) -> 'OperatorChain':
+        """
+        :return: The chain with the previous operators.
+        """
+        return self._previous
+
+    def __init__(self, operator: Operator = None, previous: 'OperatorChain' = None) -> None:
+        """ Constructor.
+
+        :param operator: The last operator of the chain.
+        :param previous: The chain with the previous operators.
+        """
+        self._operator, self._previous = operator, previous
+        self._length = previous._length + 1 if previous is not None else 0
+        self._hash = None
+
+    def append(self, operator: Operator) -> 'OperatorChain':
+        """ Create a new chain adding an operator to this one.
+
+        :param operator: The operator to add.
+        :return: The new chain.
+        """
+        return OperatorChain(operator, self)
+
+    def __len__(self) -> int:
+        """
+        :return: The number of operators.
+        """
+        return self._length
+
+    def __getitem__(self, index: Union[int, slice]) -> Union[Operator, List[Operator]]:
+        """ Get an operator or a list of them. The last operator is obtained in constant time,
+           but the rest of the positions need to create the list of operators.
+
+        :param index: The position or a slice.
+        :return: The operator in that position, or a list of operators if the index is a slice.
+        """
+        if index == -1 and self._length:
+            return self._operator
+        return self.to_list()[index]
+
+    def __iter__(self) -> Iterator[Operator]:
+        """
+        :return: An iterator over the operators, from the first one to the last one.
+        """
+        return iter(self.to_list())
+
+    def __hash__(self) -> int:
+        """ A hash of the operators, which is calculated only once from the hash of the previous chain.
+
+        :return: An integer that represents the hash.
+        """
+        if self._hash is None:
+            self._hash = hash((hash(self._previous), self._operator)) if self._length else hash(())
+        return self._hash
+
+    def __eq__(self, other: Any) -> bool:
+        """ Compare this chain with other chain or sequence of operators.
+
+        :param other: The other sequence.
+        :return: True if both have the same operators.
+        """
+        return isinstance(other, Sequence) and len(self) == len(other) and self.to_list() == list(other)
+
+    def __repr__(self) -> str:
+        """
+        :return: The representation of the list of operators.
+        """
+        return repr(self.to_list())
+
+    def to_list(self) -> List[Operator]:
+        """
+        :return: A list with the operators, from the first one to the last one.
+        """
+        operators, chain = [], self
+        while chain._length:
+            operators.append(chain._operator)
+            chain = chain._previous
+        operators.reverse()
+        return operators
+
+    def path(self) -> List[Any]:
+        """
+        :return: The elements obtained by applying all the operators of this chain.
+        """
+        return [element for operator in self.to_list() for element in operator.operate()]
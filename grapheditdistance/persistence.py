@@ -0,0 +1,87 @@
+import mmap as mm
+import pickle
+import struct
+import sys
+from array import array
+from typing import Dict, Sequence, Tuple, Any
+
+MAGIC = b'GEDGRAPH'
+FORMAT_VERSION = 3
+# The magic string, the format version and the header length
+PREFIX = struct.Struct('<8sIQ')
+ALIGNMENT = 8
+
+
+def save(path: str, header: Dict[str, Any], arrays: Dict[str, Sequence[int]]) -> None:
+    """ Save a header and several arrays in a binary file. The header is pickled, and each array is stored
+       as raw bytes and aligned to 8 bytes, therefore, the arrays can be memory-mapped when the file is loaded.
+
+    :param path: The file path.
+    :param header: A dictionary with any picklable object.
+    :param arrays: A dictionary with the name and the content of each array. The arrays have to support the buffer
+       protocol, for example, array.array or memoryview objects.
+    """
+    descriptors, offset = [], 0
+    views = [memoryview(values) for values in arrays.values()]
+    for name, view in zip(arrays, views):
+        descriptors.append((name, view.format, view.itemsize, offset, len(view)))
+        offset = _align(offset + view.nbytes)
+    header = dict(header, arrays=descriptors, byteorder=sys.byteorder)
+    header_bytes = pickle.dumps(header, protocol=pickle.HIGHEST_PROTOCOL)
+    data_start = _align(PREFIX.size + len(header_bytes))
+    with open(path, 'wb') as file:
+        file.write(PREFIX.pack(MAGIC, FORMAT_VERSION, len(header_bytes)))
+        file.write(header_bytes)
+        file.write(bytes(data_start - file.tell()))
+        for (_, _, _, offset, _), view in zip(descriptors, views):
+            file.write(bytes(data_start + offset - file.tell()))
+            file.write(view.tobytes())
+
+
+def load(path: str, mmap: bool = True) -> Tuple[Dict[str, Any], Dict[str, Sequence[int]]]:
+    """ Load a file saved with the save() function.
+       Only load files from trusted sources because the header is unpickled.
+
+    :param path: The file path.
+    :param mmap: If True, the arrays are memory views of the memory-mapped file, without copying them into memory.
+       Then, several processes that load the same file share its content through the page cache.
+       Otherwise, the file is read into memory.
+    :return: A tuple with the header and a dictionary with the arrays.
+    """
+    with open(path, 'rb') as file:
+        magic, version, header_length = PREFIX.unpack(file.read(PREFIX.size))
+        if magic != MAGIC:
+            raise ValueError(f'The file "{path}" is not a saved graph.')
+        if version != FORMAT_VERSION:
+            raise ValueError(f'The file "{path}" has the format version {version}, but only {FORMAT_VERSION} '
+                             f'is supported.')
+        header = pickle.loads(file.read(header_length))
+        data_start = _align(PREFIX.size + header_length)
+        # The arrays cannot be mapped if they were saved in a machine with a different byte order
+        swap = header.pop('byteorder') != sys.byteorder
+        if mmap and not swap:
+            buffer = memoryview(mm.mmap(file.fileno(), 0, access=mm.ACCESS_READ))
+        else:
+            file.seek(0)
+            buffer = memoryview(file.read())
+    arrays = {}
+    for name, typecode, itemsize, offset, length in header.pop('arrays'):
+        data = buffer[data_start + offset:data_start + offset + length * itemsize]
+        if swap:
+            arrays[name] = array(typecode, data.tobytes())
+            arrays[name].byteswap()
+        else:
+            arrays[name] = data.cast(typecode)
+        if arrays[name].itemsize != itemsize:
+            raise ValueError(f'The array "{name}" of the file "{path}" has items of {itemsize} bytes, but in this '
+                             f'machine they have {arrays[name].itemsize} bytes.')
+    return header, arrays
+
+
+def _align(position: int) -> int:
+    """ Calculate the next aligned position.
+
+    :param position: The position.
+    :return: The first position aligned to ALIGNMENT bytes, which is equal or greater than the given one.
+    """
+    return (position + ALIGNMENT - 1) // ALIGNMENT * ALIGNMENT
@@ -0,0 +1,43 @@
+from typing import Any, Hashable, Iterable, List, Sequence
+
+from grapheditdistance.operators import Operator
+
+
+class SearchResults(list):
+    """ The list of results of a search, where each result is a tuple with the found entity, the edition distance
+       value, and the list of applied operators. If the search was stopped before finishing, for example, because
+       its budget ran out, the results are the best ones found so far and they are marked as incomplete.
+       If the search statistics were collected, they are in the attribute "stats", otherwise, it is None.
+    """
+    def __init__(self, results: Iterable[tuple] = (), complete: bool = True) -> None:
+        """ Constructor.
+
+        :param results: The search results.
+        :param complete: False if the search was stopped before finishing.
+        """
+        super().__init__(results)
+        self.complete = complete
+        self.stats = None
+
+
+class SearchResult(tuple):
+    """ A search result, which is a tuple with the found entity, the edition distance value, and the list of applied
+       operators. The payload stored with the found entity is in the payload attribute, None if it does not have one.
+    """
+    def __new__(cls, entity: Sequence[Hashable], distance: float, operators: List[Operator], payload: Any = None):
+        """ Constructor.
+
+        :param entity: The found entity.
+        :param distance: The edition distance value.
+        :param operators: The list of applied operators.
+        :param payload: The payload of the found entity.
+        """
+        result = super().__new__(cls, (entity, distance, operators))
+        result.payload = payload
+        return result
+
+    def __getnewargs__(self) -> tuple:
+        """
+        :return: The arguments of the constructor to unpickle this result.
+        """
+        return (*self, self.payload)
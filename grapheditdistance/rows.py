@@ -0,0 +1,306 @@
+from math import inf
+from time import perf_counter
+from typing import Sequence, Hashable, List, Tuple
+
+import numpy as np
+
+from grapheditdistance.consts import INIT_NODE, FINAL_NODE
+from grapheditdistance.base import BaseGraph
+from grapheditdistance.stats import SearchStats
+from grapheditdistance.operators import Operator, NoneOperator, ReplaceOperator, InsertOperator, DeleteOperator, \
+    FinalOperator
+
+# The minimum number of nodes of an entity trie with several entities to calculate its rows with NumPy
+VECTOR_SIZE = 512
+
+
+class QueryTrie(object):
+    """ A trie of the entities to search, where the position 0 is the root, and each node is the prefix of
+       one or more entities. The parent of a node always has a lower position.
+    """
+    def __init__(self, entities: Sequence[Sequence[Hashable]], distance, threshold: float) -> None:
+        """ Constructor.
+
+        :param entities: The entities to search.
+        :param distance: The Levenshtein distance.
+        :param threshold: The edit distance threshold with respect to the length of the entities.
+        """
+        # The parent, the element, the insertion cost of the element and the depth of each node
+        self.parents, self.elements, self.insert_costs, self.depths = [0], [None], [0.], [0]
+        # The nodes where each entity ends, and the limit of the entities that end at each node
+        self.ends, self.limits = [], {}
+        children = {}
+        for entity in entities:
+            node = 0
+            for element in entity:
+                child = children.get((node, element))
+                if child is None:
+                    child = children[(node, element)] = len(self.parents)
+                    self.parents.append(node)
+                    self.elements.append(element)
+                    self.insert_costs.append(distance.insert_cost(element))
+                    self.depths.append(self.depths[node] + 1)
+                node = child
+            self.ends.append(node)
+            self.limits[node] = len(entity) * (1 - threshold)
+
+    def __len__(self) -> int:
+        """
+        :return: The number of nodes, including the root.
+        """
+        return len(self.parents)
+
+    def columns(self, node: int) -> List[int]:
+        """ The path from the root to a node.
+
+        :param node: The node.
+        :return: The list of nodes from the root to the given one, both included.
+        """
+        columns = [node]
+        while node:
+            node = self.parents[node]
+            columns.append(node)
+        columns.reverse()
+        return columns
+
+
+class VectorRows(object):
+    """ Calculate the Levenshtein rows of an entity trie with NumPy, using the cost tables of the distance.
+       The cells of all the entity trie nodes with the same depth are calculated at once.
+    """
+    def __init__(self, query: QueryTrie, distance) -> None:
+        """ Constructor.
+
+        :param query: The trie of the entities to search.
+        :param distance: The Levenshtein distance. Its costs have to be compiled by its cost_tables() method.
+        """
+        self.tables = distance.cost_tables()
+        self.parents, self.insert_costs = np.array(query.parents, np.intp), np.array(query.insert_costs)
+        self.codes = self.tables.encode(query.elements)
+        # The elements are interned to compare them with the node values
+        self.element_ids = {}
+        self.elements = np.array([self.element_ids.setdefault(element, len(self.element_ids))
+                                  for element in query.elements], np.intp)
+        depths = np.array(query.depths, np.intp)
+        order = np.argsort(depths, kind='stable')
+        bounds = np.searchsorted(depths[order], np.arange(depths.max() + 2))
+        self.levels = [order[bounds[depth]:bounds[depth + 1]] for depth in range(1, depths.max() + 1)]
+        self.ends, self.limits = np.array(list(query.limits), np.intp), np.array(list(query.limits.values()))
+
+    def next_row(self, prev_row: np.ndarray, active: np.ndarray, value: Hashable) -> Tuple[np.ndarray, np.ndarray]:
+        """ Calculate the Levenshtein row of a graph node from the row of its previous one.
+           Only the cells of the active entity trie nodes are calculated, the rest of them are infinite.
+
+        :param prev_row: The row of the previous graph node.
+        :param active: A boolean array with the entity trie nodes which can achieve the limit through
+           the previous graph node.
+        :param value: The graph node value.
+        :return: The new row, and the entity trie nodes which can still achieve the limit through this row.
+        """
+        parents, code = self.parents, self.tables.code(value)
+        delete_cost = self.tables.delete_costs[code]
+        replace_costs = self.tables.replace_costs[self.codes, code]
+        replace_costs[self.elements == self.element_ids.get(value, -1)] = 0
+        row = np.minimum(prev_row + delete_cost, prev_row[parents] + replace_costs)
+        row[0] = prev_row[0] + delete_cost
+        row[~active] = inf
+        minimums = row.copy()
+        for level in self.levels:
+            level = level[active[level]]
+            row[level] = np.minimum(row[level], row[parents[level]] + self.insert_costs[level])
+            minimums[level] = np.minimum(minimums[parents[level]], row[level])
+        # Keep the entity ends which can achieve the limit and their ancestors
+        needed = np.zeros(len(row), bool)
+        needed[self.ends] = minimums[self.ends] <= self.limits
+        for level in reversed(self.levels):
+            needed[parents[level[needed[level]]]] = True
+        return row, active & needed
+
+
+def search(graph: BaseGraph,
+           entity: Sequence[Hashable],
+           threshold: float = 0.8,
+           nbest: int = 1,
+           stats: SearchStats = None) -> List[tuple]:
+    """ Search an entity walking the graph trie in depth and calculating a Levenshtein row for each node.
+       The subtree of a node is pruned when the minimum of its row exceeds the threshold limit.
+
+    :param graph: The graph to search in. Its distance has to be a Levenshtein distance.
+    :param entity: The entity to search.
+    :param threshold: The edit distance threshold with respect to the length of the entity.
+    :param nbest: The number of best results. If 0, then return all the results that exceed the threshold.
+    :param stats: The statistics to update, or None to not collect them. Each graph node whose row is calculated
+       is an expansion, and each cell of its row is a candidate.
+    :return: A list of tuples with the found entity, the edition distance value, and the list of applied operators,
+       sorted by edition distance. Each indexed entity only appears once, with its best list of operators.
+    """
+    return search_batch(graph, [entity], threshold, nbest, stats)[0]
+
+
+def search_batch(graph: BaseGraph,
+                 entities: Sequence[Sequence[Hashable]],
+                 threshold: float = 0.8,
+                 nbest: int = 1,
+                 stats: SearchStats = None) -> List[List[tuple]]:
+    """ Search several entities at once, walking the graph trie in depth together with a trie of the entities.
+       Each graph node has a Levenshtein row with a cell for each node of the entity trie, therefore,
+       the cells of a common prefix are only calculated once for all the entities that share it.
+       The subtree of a graph node is pruned when no entity can achieve its threshold limit.
+
+    :param graph: The graph to search in. Its distance has to be a Levenshtein distance.
+    :param entities: The entities to search.
+    :param threshold: The edit distance threshold with respect to the length of the entity.
+    :param nbest: The number of best results. If 0, then return all the results that exceed the threshold.
+    :param stats: The statistics to update, or None to not collect them.
+    :return: A list with the results of each entity, in the same order as the entities, and equal to the search()
+       results of that entity.
+    """
+    distance = graph.distance
+    query = QueryTrie(entities, distance, threshold)
+    # The first row is the cost of inserting all the entity elements before any node
+    row = [0.]
+    for node in range(1, len(query)):
+        row.append(row[query.parents[node]] + query.insert_costs[node])
+    # Each graph node to explore has its depth and the entity trie nodes which can achieve the limit through it
+    active = list(range(len(query)))
+    vector_rows = VectorRows(query, distance) \
+        if len(query.limits) > 1 and len(query) >= VECTOR_SIZE and _has_cost_tables(distance) else None
+    if vector_rows is not None:
+        row, active = np.array(row), np.ones(len(query), bool)
+    # The rows, values and nodes of the current path, where the position 0 is the init node
+    rows, values, nodes = [row], [], [INIT_NODE]
+    results = {end: [] for end in query.limits}
+    stack = [(node, 1, active) for node in reversed(list(graph.adjacent(INIT_NODE))) if node != FINAL_NODE]
+    while stack:
+        node, depth, active = stack.pop()
+        # Go back to the parent of this node
+        del rows[depth:], values[depth - 1:], nodes[depth:]
+        value = graph.value(node)
+        start = perf_counter() if stats is not None else 0.
+        if vector_rows is not None:
+            row, active = vector_rows.next_row(rows[-1], active, value)
+        else:
+            row, active = _next_row(distance, query, rows[-1], active, value)
+        if stats is not None:
+            stats.costs_seconds += perf_counter() - start
+            stats.expansions += 1
+            stats.candidates += len(row)
+        rows.append(row)
+        values.append(value)
+        nodes.append(node)
+        adjacent = list(graph.adjacent(node))
+        # If the node is the end of an indexed entity, add it to the results of the entities which achieve the limit
+        if FINAL_NODE in adjacent:
+            for end, limit in query.limits.items():
+                if row[end] <= limit:
+                    columns = query.columns(end)
+                    entity = [query.elements[column] for column in columns[1:]]
+                    operators = backtrace(distance, entity, rows, values, nodes, columns)
+                    results[end].append(graph._result(list(values), float(row[end]), operators, node))
+        # Only continue through this node if some of the entities can achieve the limit
+        if active.any() if vector_rows is not None else active:
+            stack.extend((next_node, depth + 1, active) for next_node in reversed(adjacent) if next_node != FINAL_NODE)
+            if stats is not None:
+                stats.peak_frontier = max(stats.peak_frontier, len(stack))
+        elif stats is not None:
+            stats.pruned_by_threshold += sum(1 for next_node in adjacent if next_node != FINAL_NODE)
+    for end_results in results.values():
+        end_results.sort(key=lambda result: result[1])
+    return [list(results[end][:nbest] if nbest else results[end]) for end in query.ends]
+
+
+def _has_cost_tables(distance) -> bool:
+    """ Check if the cost tables of a distance are valid, this is, if its costs are not overridden by a subclass
+       that does not compile them again.
+
+    :param distance: The Levenshtein distance.
+    :return: True if the distance class that compiles the cost tables is the one that defines the costs or a subclass.
+    """
+    return distance._defines_costs('cost_tables', *distance._cost_methods)
+
+
+def _next_row(distance,
+              query: QueryTrie,
+              prev_row: List[float],
+              active: List[int],
+              value: Hashable) -> Tuple[List[float], List[int]]:
+    """ Calculate the Levenshtein row of a graph node from the row of its previous one.
+       Only the cells of the active entity trie nodes are calculated, the rest of them are infinite.
+
+    :param distance: The Levenshtein distance.
+    :param query: The trie of the entities to search.
+    :param prev_row: The row of the previous graph node.
+    :param active: The entity trie nodes which can achieve the limit through the previous graph node, sorted.
+    :param value: The graph node value.
+    :return: The new row, and the entity trie nodes which can still achieve the limit through this row.
+       An entity can achieve its limit when the minimum cost in the path from the root to the entity end is lower than
+       its limit, then, all the nodes in that path are still active.
+    """
+    parents, elements, insert_costs, limits = query.parents, query.elements, query.insert_costs, query.limits
+    delete_cost = distance.delete_cost(value)
+    if len(limits) == 1:
+        # With only one entity end, the entity trie is a chain where the parent of each node is the previous one
+        row = [prev_row[0] + delete_cost]
+        for node in range(1, len(prev_row)):
+            element = elements[node]
+            replace_cost = 0 if element == value else distance.replace_cost(element, value)
+            cost = min(prev_row[node] + delete_cost, row[-1] + insert_costs[node], prev_row[node - 1] + replace_cost)
+            row.append(cost)
+        return row, active if min(row) <= next(iter(limits.values())) else []
+    row, minimums = [inf] * len(prev_row), [inf] * len(prev_row)
+    for node in active:
+        if node:
+            parent, element = parents[node], elements[node]
+            replace_cost = 0 if element == value else distance.replace_cost(element, value)
+            cost = min(prev_row[node] + delete_cost, row[parent] + insert_costs[node], prev_row[parent] + replace_cost)
+            row[node], minimums[node] = cost, min(minimums[parent], cost)
+        else:
+            row[0] = minimums[0] = prev_row[0] + delete_cost
+    # Keep the entity ends which can achieve the limit and their ancestors
+    needed = [False] * len(prev_row)
+    for node in reversed(active):
+        if needed[node] or node in limits and minimums[node] <= limits[node]:
+            needed[node] = needed[parents[node]] = True
+    return row, [node for node in active if needed[node]]
+
+
+def backtrace(distance,
+              entity: Sequence[Hashable],
+              rows: List[List[float]],
+              values: List[Hashable],
+              nodes: List[int],
+              columns: Sequence[int] = None) -> List[Operator]:
+    """ Obtain the list of operators of the best alignment between the entity and a path.
+
+    :param distance: The Levenshtein distance used to calculate the rows.
+    :param entity: The entity to search.
+    :param rows: The rows of each node in the path, where the first one corresponds to the init node.
+    :param values: The values of each node in the path, without the init node.
+    :param nodes: The node ids in the path, where the first one is the init node.
+    :param columns: The row position of each entity prefix. By default, the prefix length.
+    :return: The list of operators from the init node to the final one.
+    """
+    columns = columns if columns is not None else range(len(entity) + 1)
+    operators = [FinalOperator()]
+    i, j = len(entity), len(values)
+    while i or j:
+        cost = rows[j][columns[i]]
+        if i and j:
+            element, value = entity[i - 1], values[j - 1]
+            if element == value and cost == rows[j - 1][columns[i - 1]]:
+                operators.append(NoneOperator(element, nodes[j]))
+                i, j = i - 1, j - 1
+                continue
+            replace_cost = distance.replace_cost(element, value)
+            if element != value and cost == rows[j - 1][columns[i - 1]] + replace_cost:
+                operators.append(ReplaceOperator(replace_cost, element, value, nodes[j]))
+                i, j = i - 1, j - 1
+                continue
+        if i and cost == rows[j][columns[i - 1]] + distance.insert_cost(entity[i - 1]):
+            operators.append(InsertOperator(distance.insert_cost(entity[i - 1]), entity[i - 1], nodes[j]))
+            i -= 1
+        else:
+            operators.append(DeleteOperator(distance.delete_cost(values[j - 1]), values[j - 1], nodes[j]))
+            j -= 1
+    operators.reverse()
+    return operators
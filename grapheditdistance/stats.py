@@ -0,0 +1,81 @@
+from time import perf_counter
+from typing import Any, Dict, Tuple
+
+from grapheditdistance.frontier import Frontier
+
+
+class SearchStats(object):
+    """ The statistics of a search, to find out why a query is slow. """
+    __slots__ = ('engine', 'cached', 'expansions', 'candidates', 'pruned_by_threshold', 'pruned_by_visited',
+                 'peak_frontier', 'costs_seconds', 'frontier_seconds', 'total_seconds', 'results', 'complete')
+
+    def __init__(self, engine: str, cached: bool = False) -> None:
+        """ Constructor.
+
+        :param engine: The search engine.
+        :param cached: True if the results were obtained from the cache, then the search counters are 0.
+        """
+        self.engine, self.cached = engine, cached
+        # The explored nodes, and the paths generated by the distance costs from them
+        self.expansions = self.candidates = 0
+        # The paths discarded because they cannot arrive to an entity end within the limit,
+        # or because they arrive to an already visited path or state
+        self.pruned_by_threshold = self.pruned_by_visited = 0
+        # The maximum number of paths waiting to be explored at the same time
+        self.peak_frontier = 0
+        # The time calculating the costs, handling the frontier, and the whole search
+        self.costs_seconds = self.frontier_seconds = self.total_seconds = 0.
+        self.results, self.complete = 0, True
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        :return: A dictionary with all the statistics, for example, to export them to a metrics system.
+        """
+        return {name: getattr(self, name) for name in self.__slots__}
+
+    def __repr__(self) -> str:
+        """
+        :return: The string representation of the statistics.
+        """
+        return f'SearchStats({", ".join(f"{name}={value!r}" for name, value in self.to_dict().items())})'
+
+
+class InstrumentedFrontier(Frontier):
+    """ A frontier which measures the time spent by other one and its peak size. """
+    def __init__(self, frontier: Frontier, stats: SearchStats) -> None:
+        """ Constructor.
+
+        :param frontier: The measured frontier.
+        :param stats: The search statistics to update.
+        """
+        self._frontier, self._stats = frontier, stats
+
+    def push(self, key: float, value: Any) -> None:
+        """ Add a path.
+
+        :param key: The path key.
+        :param value: The path.
+        """
+        start = perf_counter()
+        self._frontier.push(key, value)
+        stats = self._stats
+        stats.frontier_seconds += perf_counter() - start
+        stats.peak_frontier = max(stats.peak_frontier, len(self._frontier))
+
+    def pop(self) -> Tuple[float, Any]:
+        """ Extract the path with the lowest key.
+
+        :return: A tuple with the key and the path.
+        :raise IndexError: If the frontier is empty.
+        """
+        start = perf_counter()
+        try:
+            return self._frontier.pop()
+        finally:
+            self._stats.frontier_seconds += perf_counter() - start
+
+    def __len__(self) -> int:
+        """
+        :return: The number of paths.
+        """
+        return len(self._frontier)
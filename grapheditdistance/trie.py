@@ -0,0 +1,699 @@
+from abc import ABC, ABCMeta, abstractmethod
+from array import array
+from typing import Any, Hashable, Iterable, List, Optional, Tuple, Sequence, Dict
+
+import numpy as np
+
+from grapheditdistance.consts import INIT_NODE
+
+NO_NODE = -1
+# The minimum suffix length of the nodes without any entity end below them
+MAX_LENGTH = 2 ** 31 - 1
+# The number of bits of the symbol summary of each node. The symbol id i sets the bit i % SYMBOL_BITS.
+SYMBOL_BITS = 64
+ALL_SYMBOLS = 2 ** SYMBOL_BITS - 1
+
+
+def symbol_bit(symbol: int) -> int:
+    """ The bit of a symbol in the symbol summaries.
+
+    :param symbol: The symbol id.
+    :return: An integer with only the bit of that symbol, or 0 for NO_NODE.
+    """
+    return 1 << symbol % SYMBOL_BITS if symbol != NO_NODE else 0
+
+
+def _compact(values: Iterable[int]) -> array:
+    """ Store integers in the smallest signed array type for them. For example, the symbol ids of a text only need
+       one byte.
+
+    :param values: The integers.
+    :return: An array of 'b', 'h' or 'i' type.
+    """
+    values = array('i', values)
+    low, high = min(values, default=0), max(values, default=0)
+    for typecode, bound in [('b', 1 << 7), ('h', 1 << 15)]:
+        if -bound <= low and high < bound:
+            return array(typecode, values)
+    return values
+
+
+def _first_used(parts: Iterable[Dict[Hashable, tuple]]) -> List[Hashable]:
+    """ Sort the values of several tables by their first use.
+
+    :param parts: Dictionaries with the key of the first use of each value in a part.
+    :return: The values of all the parts sorted by their lowest key.
+    """
+    first = {}
+    for part in parts:
+        for value, key in part.items():
+            if value not in first or key < first[value]:
+                first[value] = key
+    return sorted(first, key=first.get)
+
+
+class BaseTrie(ABC):
+    """ An abstract trie stored in parallel arrays, where each node is an integer id and the position 0 is the root.
+       The node values are interned in a symbol table and the arrays only store their symbol ids.
+       The edge weights are also interned, because most of them are usually equal.
+    """
+    __metaclass__ = ABCMeta
+
+    @property
+    def symbols(self) -> List[Hashable]:
+        """
+        :return: The symbol table, where the position of each value is its symbol id.
+        """
+        return self._symbols
+
+    @property
+    def weight_table(self) -> List[tuple]:
+        """
+        :return: The weight table, where the position of each tuple of edge weights is its weight id.
+        """
+        return self._weight_table
+
+    @property
+    def nodes(self) -> range:
+        """
+        :return: The node ids.
+        """
+        return range(len(self._values))
+
+    @property
+    def payloads(self) -> Dict[int, Any]:
+        """
+        :return: The payload of each final node that has one.
+        """
+        return self._payloads
+
+    def __init__(self, symbols: List[Hashable], weight_table: List[tuple], values: array, weights: array,
+                 finals: array, min_lengths: array, max_lengths: array, symbol_masks: array,
+                 payloads: Dict[int, Any] = None) -> None:
+        """ Constructor.
+
+        :param symbols: The symbol table.
+        :param weight_table: The weight table.
+        :param values: The symbol id of each node.
+        :param weights: The weight id of the edge that arrives to each node.
+        :param finals: The weight id of the edge from each node to the final node, NO_NODE if it is not final.
+        :param min_lengths: The minimum number of nodes from each node to an entity end, MAX_LENGTH if there is not
+           any entity end below the node.
+        :param max_lengths: The maximum number of nodes from each node to an entity end, -1 if there is not
+           any entity end below the node.
+        :param symbol_masks: A summary of the symbols below each node, where each symbol sets its symbol_bit().
+           Different symbols can set the same bit, therefore, if the bit of a symbol is not set, that symbol is
+           not below the node, but otherwise, it may be.
+        :param payloads: The payload of each final node that has one.
+        """
+        self._symbols, self._symbol_ids = symbols, {value: i for i, value in enumerate(symbols)}
+        self._weight_table, self._weight_ids = weight_table, {weights: i for i, weights in enumerate(weight_table)}
+        self._values, self._weights, self._finals = values, weights, finals
+        self._min_lengths, self._max_lengths, self._symbol_masks = min_lengths, max_lengths, symbol_masks
+        self._payloads = payloads if payloads is not None else {}
+
+    def __len__(self) -> int:
+        """
+        :return: The number of nodes, including the root.
+        """
+        return len(self._values)
+
+    def symbol_id(self, value: Hashable) -> int:
+        """ Get the symbol id of a value.
+
+        :param value: The value.
+        :return: The symbol id, or NO_NODE if that value is not in the symbol table.
+        """
+        return self._symbol_ids.get(value, NO_NODE)
+
+    def symbol(self, node: int) -> int:
+        """ The symbol id of a node.
+
+        :param node: The node id.
+        :return: The symbol id, NO_NODE for the root.
+        """
+        return self._values[node]
+
+    def value(self, node: int) -> Hashable:
+        """ The value of a node.
+
+        :param node: The node id. It cannot be the root.
+        :return: The node value.
+        """
+        return self._symbols[self._values[node]]
+
+    @abstractmethod
+    def child(self, node: int, symbol: int) -> int:
+        """ Get the child of a node with a given symbol.
+
+        :param node: The node id.
+        :param symbol: The symbol id.
+        :return: The child id, or NO_NODE if the node does not have a child with that symbol.
+        """
+        pass
+
+    @abstractmethod
+    def children(self, node: int) -> Iterable[int]:
+        """ The children of a node.
+
+        :param node: The node id.
+        :return: An iterable with the children ids.
+        """
+        pass
+
+    def is_final(self, node: int) -> bool:
+        """ If a node is the end of an entity.
+
+        :param node: The node id.
+        :return: True if the node has an edge to the final node.
+        """
+        return self._finals[node] != NO_NODE
+
+    def weights(self, node: int) -> Tuple[Tuple[str, float], ...]:
+        """ The weights of the edge that arrives to a node.
+
+        :param node: The node id.
+        :return: A tuple of pairs with the key and the weight of each edge.
+        """
+        return self._weight_table[self._weights[node]] if self._weights[node] != NO_NODE else ()
+
+    def final_weights(self, node: int) -> Tuple[Tuple[str, float], ...]:
+        """ The weights of the edge from a node to the final one.
+
+        :param node: The node id.
+        :return: A tuple of pairs with the key and the weight of each edge.
+        """
+        return self._weight_table[self._finals[node]] if self._finals[node] != NO_NODE else ()
+
+    def payload(self, node: int) -> Any:
+        """ The payload of the entity that ends in a node.
+
+        :param node: The node id.
+        :return: The payload, or None if the entity does not have a payload.
+        """
+        return self._payloads.get(node)
+
+    def length_range(self, node: int) -> Tuple[int, int]:
+        """ The range of suffix lengths of a node, this is, the number of nodes from it to the entity ends below it.
+
+        :param node: The node id.
+        :return: A tuple with the minimum and the maximum suffix length. If there is not any entity end below
+           the node, (MAX_LENGTH, -1).
+        """
+        return self._min_lengths[node], self._max_lengths[node]
+
+    def symbol_mask(self, node: int) -> int:
+        """ The summary of the symbols below a node.
+
+        :param node: The node id.
+        :return: An integer with the symbol_bit() of each symbol below the node.
+        """
+        return self._symbol_masks[node]
+
+
+class Trie(BaseTrie):
+    """ A mutable trie, where the children of each node are a linked list in insertion order. """
+    @property
+    def nodes(self) -> Sequence[int]:
+        """
+        :return: The node ids, without the ids of the deleted nodes.
+        """
+        if not self._free:
+            return range(len(self._values))
+        return [node for node in range(len(self._values)) if node == INIT_NODE or self._values[node] != NO_NODE]
+
+    def __init__(self) -> None:
+        """ Constructor of an empty trie, only with its root. """
+        super().__init__([], [], array('i', [NO_NODE]), array('i', [NO_NODE]), array('i', [NO_NODE]),
+                         array('i', [MAX_LENGTH]), array('i', [-1]), array('Q', [0]))
+        # The first and last child of each node, and its next sibling
+        self._first_child = array('i', [NO_NODE])
+        self._last_child = array('i', [NO_NODE])
+        self._next_sibling = array('i', [NO_NODE])
+        # The children of each node by their symbol id. The key is (node << 32) | symbol_id.
+        self._children = {}
+        # The existing nodes linked as children of other ones, which already have a parent
+        self._links = {}
+        # If some node has several parents, the suffix annotations cannot be updated incrementally.
+        # Then, they are recalculated when they are needed.
+        self._shared, self._outdated = False, False
+        # The ids of the deleted nodes, which are reused by the next created ones
+        self._free = []
+
+    def intern(self, value: Hashable) -> int:
+        """ Get the symbol id of a value, adding it to the symbol table if it is new.
+
+        :param value: The value.
+        :return: The symbol id.
+        """
+        symbol = self._symbol_ids.get(value)
+        if symbol is None:
+            symbol = self._symbol_ids[value] = len(self._symbols)
+            self._symbols.append(value)
+        return symbol
+
+    def child(self, node: int, symbol: int) -> int:
+        """ Get the child of a node with a given symbol.
+
+        :param node: The node id.
+        :param symbol: The symbol id.
+        :return: The child id, or NO_NODE if the node does not have a child with that symbol.
+        """
+        return self._children.get((node << 32) | symbol, NO_NODE)
+
+    def children(self, node: int) -> Iterable[int]:
+        """ Iterate over the children of a node, in insertion order. The linked children are after the created ones.
+
+        :param node: The node id.
+        :return: An iterator with the children ids.
+        """
+        child = self._first_child[node]
+        while child != NO_NODE:
+            yield child
+            child = self._next_sibling[child]
+        yield from self._links.get(node, ())
+
+    def add_child(self, node: int, symbol: int) -> int:
+        """ Create a new child of a node.
+
+        :param node: The parent node id.
+        :param symbol: The symbol id of the new node.
+        :return: The id of the new node.
+        """
+        if self._free:
+            child = self._free.pop()
+            self._values[child] = symbol
+        else:
+            child = len(self._values)
+            self._values.append(symbol)
+            self._first_child.append(NO_NODE)
+            self._last_child.append(NO_NODE)
+            self._next_sibling.append(NO_NODE)
+            self._weights.append(NO_NODE)
+            self._finals.append(NO_NODE)
+            self._min_lengths.append(MAX_LENGTH)
+            self._max_lengths.append(-1)
+            self._symbol_masks.append(0)
+        last = self._last_child[node]
+        if last == NO_NODE:
+            self._first_child[node] = child
+        else:
+            self._next_sibling[last] = child
+        self._last_child[node] = child
+        self._children[(node << 32) | symbol] = child
+        return child
+
+    def link(self, node: int, child: int) -> None:
+        """ Add an existing node as the last child of other one. The node keeps its previous parents,
+           therefore, it is not added to the sibling linked list, which is only for the nodes created by add_child().
+
+        :param node: The parent node id.
+        :param child: The child node id.
+        """
+        self._links.setdefault(node, []).append(child)
+        self._children[(node << 32) | self._values[child]] = child
+        self._shared = self._outdated = True
+
+    def set_weights(self, node: int, weights: Sequence[Tuple[str, float]]) -> None:
+        """ Set the weights of the edge that arrives to a node.
+
+        :param node: The node id.
+        :param weights: A sequence of pairs with the key and the weight of each edge.
+        """
+        self._weights[node] = self.__intern_weights(weights)
+
+    def set_final(self, node: int, weights: Sequence[Tuple[str, float]]) -> None:
+        """ Mark a node as the end of an entity, setting the weights of its edge to the final node.
+
+        :param node: The node id.
+        :param weights: A sequence of pairs with the key and the weight of each edge.
+        """
+        self._finals[node] = self.__intern_weights(weights)
+
+    def set_payload(self, node: int, payload: Any) -> None:
+        """ Set the payload of the entity that ends in a node.
+
+        :param node: The final node id.
+        :param payload: The payload.
+        """
+        self._payloads[node] = payload
+
+    def remove(self, nodes: Sequence[int]) -> None:
+        """ Remove an entity. Its last node is not final anymore, and the nodes of its path which are not part of
+           other entities are deleted, from the end to the first one with other children or entity ends.
+           The suffix annotations of the rest of the path are recalculated from their children, until one of them
+           does not change. If some node has several parents, the nodes are not deleted.
+
+        :param nodes: The path of the entity, from the root to the node of its last element.
+        """
+        self._finals[nodes[-1]] = NO_NODE
+        self._payloads.pop(nodes[-1], None)
+        if self._shared:
+            self._outdated = True
+            return
+        end = len(nodes) - 1
+        while end and self._first_child[nodes[end]] == NO_NODE and self._finals[nodes[end]] == NO_NODE:
+            self.__delete_leaf(nodes[end - 1], nodes[end])
+            end -= 1
+        min_lengths, max_lengths, symbol_masks, values = \
+            self._min_lengths, self._max_lengths, self._symbol_masks, self._values
+        for node in reversed(nodes[:end + 1]):
+            min_length, max_length = (0, 0) if self.is_final(node) else (MAX_LENGTH, -1)
+            symbol_mask = 0
+            for child in self.children(node):
+                if max_lengths[child] >= 0:
+                    min_length = min(min_length, min_lengths[child] + 1)
+                    max_length = max(max_length, max_lengths[child] + 1)
+                    symbol_mask |= symbol_masks[child] | 1 << values[child] % SYMBOL_BITS
+            if (min_lengths[node], max_lengths[node], symbol_masks[node]) == (min_length, max_length, symbol_mask):
+                break
+            min_lengths[node], max_lengths[node], symbol_masks[node] = min_length, max_length, symbol_mask
+
+    def __delete_leaf(self, parent: int, node: int) -> None:
+        """ Delete a node without children, and reserve its id to be reused.
+
+        :param parent: The parent node id.
+        :param node: The node id.
+        """
+        previous, sibling = NO_NODE, self._first_child[parent]
+        while sibling != node:
+            previous, sibling = sibling, self._next_sibling[sibling]
+        if previous == NO_NODE:
+            self._first_child[parent] = self._next_sibling[node]
+        else:
+            self._next_sibling[previous] = self._next_sibling[node]
+        if self._last_child[parent] == node:
+            self._last_child[parent] = previous
+        del self._children[(parent << 32) | self._values[node]]
+        self._values[node] = self._weights[node] = self._next_sibling[node] = NO_NODE
+        self._min_lengths[node], self._max_lengths[node], self._symbol_masks[node] = MAX_LENGTH, -1, 0
+        self._free.append(node)
+
+    def add_path(self, nodes: Sequence[int]) -> None:
+        """ Update the suffix annotations of the nodes of a new entity.
+
+        :param nodes: The path of the entity, from the root to the node of its last element.
+        """
+        if self._shared:
+            self._outdated = True
+            return
+        min_lengths, max_lengths, symbol_masks, values = \
+            self._min_lengths, self._max_lengths, self._symbol_masks, self._values
+        symbol_mask, length = 0, len(nodes) - 1
+        for i in range(length, -1, -1):
+            node, suffix = nodes[i], length - i
+            if min_lengths[node] > suffix:
+                min_lengths[node] = suffix
+            if max_lengths[node] < suffix:
+                max_lengths[node] = suffix
+            symbol_masks[node] |= symbol_mask
+            if node:
+                symbol_mask |= 1 << values[node] % SYMBOL_BITS
+
+    def length_range(self, node: int) -> Tuple[int, int]:
+        """ The range of suffix lengths of a node, this is, the number of nodes from it to the entity ends below it.
+           If the annotations are outdated, they are recalculated.
+
+        :param node: The node id.
+        :return: A tuple with the minimum and the maximum suffix length. If there is not any entity end below
+           the node, (MAX_LENGTH, -1).
+        """
+        if self._outdated:
+            self.__update_annotations()
+        return self._min_lengths[node], self._max_lengths[node]
+
+    def symbol_mask(self, node: int) -> int:
+        """ The summary of the symbols below a node. If the annotations are outdated, they are recalculated.
+
+        :param node: The node id.
+        :return: An integer with the symbol_bit() of each symbol below the node.
+        """
+        if self._outdated:
+            self.__update_annotations()
+        return self._symbol_masks[node]
+
+    def __update_annotations(self) -> None:
+        """ Calculate the suffix length ranges and symbol summaries of all the nodes. If the linked nodes form
+           a cycle, the suffixes are unbounded, then the ranges of all the nodes are set to (0, MAX_LENGTH),
+           and their summaries to ALL_SYMBOLS.
+        """
+        self._min_lengths, self._max_lengths = array('i', [MAX_LENGTH]) * len(self), array('i', [-1]) * len(self)
+        self._symbol_masks = array('Q', [0]) * len(self)
+        # 0 for unvisited nodes, 1 for the nodes in the current path, and 2 for the already calculated ones
+        states = bytearray(len(self))
+        for root in self.nodes:
+            if not states[root] and not self.__update_subtree_annotations(root, states):
+                self._min_lengths, self._max_lengths = array('i', [0]) * len(self), array('i', [MAX_LENGTH]) * len(self)
+                self._symbol_masks = array('Q', [ALL_SYMBOLS]) * len(self)
+                break
+        self._outdated = False
+
+    def __update_subtree_annotations(self, root: int, states: bytearray) -> bool:
+        """ Calculate the suffix annotations of the unvisited nodes below a node in post-order.
+
+        :param root: The node.
+        :param states: The state of each node: 0 for the unvisited ones, 1 for the ones in the current path,
+           and 2 for the already calculated ones.
+        :return: False if a cycle was found, otherwise True.
+        """
+        min_lengths, max_lengths, symbol_masks = self._min_lengths, self._max_lengths, self._symbol_masks
+        states[root], stack = 1, [(root, self.children(root))]
+        while stack:
+            node, children = stack[-1]
+            child = next(children, NO_NODE)
+            if child == NO_NODE:
+                stack.pop()
+                states[node] = 2
+                if self.is_final(node):
+                    min_lengths[node] = max_lengths[node] = 0
+                for child in self.children(node):
+                    if max_lengths[child] >= 0:
+                        min_lengths[node] = min(min_lengths[node], min_lengths[child] + 1)
+                        max_lengths[node] = max(max_lengths[node], max_lengths[child] + 1)
+                        symbol_masks[node] |= symbol_masks[child] | symbol_bit(self._values[child])
+            elif not states[child]:
+                states[child] = 1
+                stack.append((child, self.children(child)))
+            elif states[child] == 1:
+                return False
+        return True
+
+    def __intern_weights(self, weights: Sequence[Tuple[str, float]]) -> int:
+        """ Get the id of a list of edge weights, adding it to the weight table if it is new.
+
+        :param weights: A sequence of pairs with the key and the weight of each edge.
+        :return: The weight id.
+        """
+        weights = tuple(weights)
+        weight_id = self._weight_ids.get(weights)
+        if weight_id is None:
+            weight_id = self._weight_ids[weights] = len(self._weight_table)
+            self._weight_table.append(weights)
+        return weight_id
+
+    @classmethod
+    def merge(cls, parts: Sequence[tuple]) -> 'Trie':
+        """ Merge the tries built from groups of entities with different first elements, as if all the entities had
+           been added to the same trie in their global order. Each part is a tuple with its trie, the global position
+           of the entity that created each node and the node depth, and two dictionaries with the (position, depth)
+           pair of the first use of each symbol and each weight tuple. The nodes, symbols and weights are renumbered
+           by those keys, the arrays are copied in one pass, and the symbol summaries are calculated again with
+           the new symbol ids.
+
+        :param parts: The parts to merge.
+        :return: The merged trie.
+        """
+        trie = cls()
+        trie._symbols = _first_used(part[3] for part in parts)
+        trie._symbol_ids = {value: i for i, value in enumerate(trie._symbols)}
+        trie._weight_table = _first_used(part[4] for part in parts)
+        trie._weight_ids = {weights: i for i, weights in enumerate(trie._weight_table)}
+        # The new id of each node is its position in the creation order
+        created_by = np.concatenate([np.frombuffer(part[1], np.longlong) for part in parts])
+        depths = np.concatenate([np.frombuffer(part[2], np.intc) for part in parts])
+        new_ids = np.empty(len(created_by), np.int64)
+        new_ids[np.lexsort((depths, created_by))] = np.arange(1, len(created_by) + 1)
+        size = len(created_by) + 1
+        values, weights, finals, first_child, last_child, next_sibling = (np.full(size, NO_NODE, np.intc)
+                                                                          for _ in range(6))
+        min_lengths, max_lengths = np.full(size, MAX_LENGTH, np.intc), np.full(size, -1, np.intc)
+        keys, children, root_children, start = [], [], [], 0
+        for part, *_ in parts:
+            # The maps from the part ids to the merged ones, where the last position maps NO_NODE to itself
+            nodes = np.concatenate(([INIT_NODE], new_ids[start:start + len(part) - 1], [NO_NODE]))
+            symbols = np.array([trie._symbol_ids[value] for value in part._symbols] + [NO_NODE], np.int64)
+            weight_ids = np.array([trie._weight_ids[weights] for weights in part._weight_table] + [NO_NODE], np.intc)
+            start += len(part) - 1
+            merged = nodes[1:-1]
+            values[merged] = symbols[np.frombuffer(part._values, np.intc)[1:]]
+            weights[merged] = weight_ids[np.frombuffer(part._weights, np.intc)[1:]]
+            finals[merged] = weight_ids[np.frombuffer(part._finals, np.intc)[1:]]
+            first_child[merged] = nodes[np.frombuffer(part._first_child, np.intc)[1:]]
+            last_child[merged] = nodes[np.frombuffer(part._last_child, np.intc)[1:]]
+            next_sibling[merged] = nodes[np.frombuffer(part._next_sibling, np.intc)[1:]]
+            min_lengths[merged] = np.frombuffer(part._min_lengths, np.intc)[1:]
+            max_lengths[merged] = np.frombuffer(part._max_lengths, np.intc)[1:]
+            min_lengths[INIT_NODE] = min(min_lengths[INIT_NODE], part._min_lengths[INIT_NODE])
+            max_lengths[INIT_NODE] = max(max_lengths[INIT_NODE], part._max_lengths[INIT_NODE])
+            root_children.append(nodes[part._first_child[INIT_NODE]])
+            trie._payloads.update((int(nodes[node]), payload) for node, payload in part._payloads.items())
+            part_keys = np.fromiter(part._children.keys(), np.int64, len(part._children))
+            keys.append((nodes[part_keys >> 32] << 32) | symbols[part_keys & 0xFFFFFFFF])
+            children.append(nodes[np.fromiter(part._children.values(), np.int64, len(part._children))])
+        # Each part has only one child of the root, then they are chained in creation order
+        root_children.sort()
+        first_child[INIT_NODE], last_child[INIT_NODE] = root_children[0], root_children[-1]
+        next_sibling[root_children[:-1]] = root_children[1:]
+        trie._values, trie._weights, trie._finals = array('i', values.tobytes()), array('i', weights.tobytes()), \
+            array('i', finals.tobytes())
+        trie._first_child, trie._last_child = array('i', first_child.tobytes()), array('i', last_child.tobytes())
+        trie._next_sibling = array('i', next_sibling.tobytes())
+        trie._min_lengths, trie._max_lengths = array('i', min_lengths.tobytes()), array('i', max_lengths.tobytes())
+        keys, children = np.concatenate(keys), np.concatenate(children)
+        trie._children = dict(zip(keys.tolist(), children.tolist()))
+        # The symbol summaries depend on the symbol ids, then they are calculated again from the deepest nodes
+        parents = np.empty(size, np.int64)
+        parents[children] = keys >> 32
+        node_depths = np.zeros(size, np.intc)
+        node_depths[new_ids] = depths
+        by_depth = np.argsort(node_depths, kind='stable')
+        bounds = np.searchsorted(node_depths[by_depth], np.arange(node_depths.max() + 2))
+        bits = np.left_shift(np.ulonglong(1), (values % SYMBOL_BITS).astype(np.ulonglong))
+        symbol_masks = np.zeros(size, np.ulonglong)
+        for depth in range(node_depths.max(), 0, -1):
+            level = by_depth[bounds[depth]:bounds[depth + 1]]
+            np.bitwise_or.at(symbol_masks, parents[level], symbol_masks[level] | bits[level])
+        trie._symbol_masks = array('Q', symbol_masks.tobytes())
+        return trie
+
+    def freeze(self, minimize: bool = False) -> 'FrozenTrie':
+        """ Create an immutable copy of this trie. The nodes are numbered in breadth-first order, and
+           the children of each node are sorted by symbol id, therefore, they have consecutive ids.
+
+        :param minimize: If True, the equivalent nodes are merged, therefore, the copy is a minimal acyclic automaton
+           (DAWG) where the entities share their common suffixes. Two nodes are equivalent if they have the same
+           symbol, the same edge weights and equivalent children, and they do not have payloads.
+           The trie is not minimized if its linked nodes form a cycle.
+        :return: The frozen trie.
+        """
+        if self._outdated:
+            self.__update_annotations()
+        representatives = self.__representatives() if minimize else None
+        order, sorted_children, visited = [0], [], bytearray(len(self))
+        for node in order:
+            next_nodes = self.children(node) if representatives is None else \
+                (representatives[child] for child in self.children(node))
+            next_nodes = sorted(next_nodes, key=self._values.__getitem__)
+            sorted_children.append(next_nodes)
+            for child in next_nodes:
+                if not visited[child]:
+                    visited[child] = 1
+                    order.append(child)
+        new_ids = array('i', bytes(4 * len(self)))
+        for new_id, node in enumerate(order):
+            new_ids[node] = new_id
+        offsets, children = array('q', [0]), array('i')
+        for next_nodes in sorted_children:
+            children.extend(new_ids[child] for child in next_nodes)
+            offsets.append(len(children))
+        # The symbol and weight ids, and the suffix lengths, usually fit in one or two bytes
+        return FrozenTrie(list(self._symbols), list(self._weight_table),
+                          _compact(self._values[node] for node in order),
+                          _compact(self._weights[node] for node in order),
+                          _compact(self._finals[node] for node in order),
+                          _compact(self._min_lengths[node] for node in order),
+                          _compact(self._max_lengths[node] for node in order),
+                          array('Q', (self._symbol_masks[node] for node in order)),
+                          offsets, children, {new_ids[node]: payload for node, payload in self._payloads.items()})
+
+    def __representatives(self) -> Optional[array]:
+        """ Find the equivalent nodes, visiting them in post-order, because two nodes are equivalent if they have
+           the same symbol, weights and payload, and their children are equivalent.
+
+        :return: The representative node of each node, or None if the linked nodes form a cycle.
+        """
+        representatives, signatures = array('i', range(len(self))), {}
+        # 0 for unvisited nodes, 1 for the nodes in the current path, and 2 for the already visited ones
+        states = bytearray(len(self))
+        states[INIT_NODE], stack = 1, [(INIT_NODE, iter(self.children(INIT_NODE)))]
+        while stack:
+            node, children = stack[-1]
+            child = next(children, NO_NODE)
+            if child == NO_NODE:
+                stack.pop()
+                states[node] = 2
+                if node != INIT_NODE:
+                    signature = (self._values[node], self._weights[node], self._finals[node],
+                                 node if node in self._payloads else NO_NODE,
+                                 tuple(sorted(representatives[child] for child in self.children(node))))
+                    representatives[node] = signatures.setdefault(signature, node)
+            elif not states[child]:
+                states[child] = 1
+                stack.append((child, iter(self.children(child))))
+            elif states[child] == 1:
+                return None
+        return representatives
+
+
+class FrozenTrie(BaseTrie):
+    """ An immutable trie in compressed sparse row format: the children of the node i are in the positions
+       from offsets[i] to offsets[i + 1] of the children array, sorted by symbol id.
+       The arrays can be any sequence of integers, for example, memory views of a memory-mapped file.
+    """
+    @property
+    def arrays(self) -> Dict[str, Sequence[int]]:
+        """
+        :return: A dictionary with the name and the content of each array of this trie.
+        """
+        return {'values': self._values, 'weights': self._weights, 'finals': self._finals,
+                'min_lengths': self._min_lengths, 'max_lengths': self._max_lengths, 'symbol_masks': self._symbol_masks,
+                'offsets': self._offsets, 'children': self._children}
+
+    def __init__(self, symbols: List[Hashable], weight_table: List[tuple], values: array, weights: array,
+                 finals: array, min_lengths: array, max_lengths: array, symbol_masks: array, offsets: array,
+                 children: array, payloads: Dict[int, Any] = None) -> None:
+        """ Constructor.
+
+        :param symbols: The symbol table.
+        :param weight_table: The weight table.
+        :param values: The symbol id of each node.
+        :param weights: The weight id of the edge that arrives to each node.
+        :param finals: The weight id of the edge from each node to the final node, NO_NODE if it is not final.
+        :param min_lengths: The minimum number of nodes from each node to an entity end.
+        :param max_lengths: The maximum number of nodes from each node to an entity end.
+        :param symbol_masks: A summary of the symbols below each node.
+        :param offsets: The position of the first child of each node in the children array, plus its length.
+        :param children: The children ids of all the nodes.
+        :param payloads: The payload of each final node that has one.
+        """
+        super().__init__(symbols, weight_table, values, weights, finals, min_lengths, max_lengths, symbol_masks,
+                         payloads)
+        self._offsets, self._children = offsets, children
+
+    def child(self, node: int, symbol: int) -> int:
+        """ Get the child of a node with a given symbol using a binary search.
+
+        :param node: The node id.
+        :param symbol: The symbol id.
+        :return: The child id, or NO_NODE if the node does not have a child with that symbol.
+        """
+        values, children = self._values, self._children
+        low, high = self._offsets[node], self._offsets[node + 1]
+        while low < high:
+            middle = (low + high) // 2
+            middle_symbol = values[children[middle]]
+            if middle_symbol < symbol:
+                low = middle + 1
+            elif middle_symbol > symbol:
+                high = middle
+            else:
+                return children[middle]
+        return NO_NODE
+
+    def children(self, node: int) -> Sequence[int]:
+        """ The children of a node, sorted by symbol id.
+
+        :param node: The node id.
+        :return: A sequence with the children ids.
+        """
+        return self._children[self._offsets[node]:self._offsets[node + 1]]
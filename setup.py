@@ -65,7 +65,6 @@ setuptools.setup(
         'networkx~=2.8.1',
         'matplotlib~=3.5.2',
         'numpy>=1.22,<1.27',
-        'multivaluedbtree~=0.0.1',
         'mysmallutils~=1.0.18'
     ]
 )
@@ -1,6 +1,11 @@
 import unittest
+from os import path
+from tempfile import TemporaryDirectory
 
-from grapheditdistance import TextGraph
+from grapheditdistance import TextGraph, INIT_NODE, FINAL_NODE, ROWS
+from grapheditdistance.distances import WeightedLevenshtein
+from grapheditdistance.encoding import EncodedEntity
+from grapheditdistance.trie import symbol_bit
 
 
 class MyTestCase(unittest.TestCase):
@@ -13,6 +18,191 @@ class MyTestCase(unittest.TestCase):
         g.draw()
         self.assertEqual(True, True)  # add assertion here
 
+    def test_graph_structure(self) -> None:
+        g = TextGraph()
+        g.index(['Saturday', 'Saturdays', 'Sun'])
+        self.assertEqual(len(g.nodes), 12)
+        self.assertEqual(g.value(INIT_NODE), '_^_')
+        self.assertEqual(g.value(FINAL_NODE), '_$_')
+        node = g.get_neighbor('S', INIT_NODE)
+        self.assertEqual(g.value(node), 'S')
+        self.assertListEqual(sorted(g.neighbors(node)), ['a', 'u'])
+        self.assertIsNone(g.get_neighbor('x', node))
+        self.assertEqual(g.get_neighbor('x', node, -5), -5)
+        for c in 'aturday':
+            node = g.get_neighbor(c, node)
+        self.assertIn(FINAL_NODE, g.adjacent(node))
+        self.assertEqual(len(g.adjacent(node)), 2)
+        self.assertListEqual(list(g.adjacent(FINAL_NODE)), [])
+        self.assertEqual(g.to_networkx().number_of_edges(), 14)
+
+    def test_suffix_annotations(self) -> None:
+        g = TextGraph()
+        g.index(['Saturday', 'Saturdays', 'Sun'])
+        self.assertEqual(g._trie.length_range(INIT_NODE), (3, 9))
+        node = g.get_neighbor('S', INIT_NODE)
+        self.assertEqual(g._trie.length_range(node), (2, 8))
+        self.assertEqual(g._trie.length_range(g.get_neighbor('u', node)), (1, 1))
+        mask = g._trie.symbol_mask(g.get_neighbor('u', node))
+        self.assertTrue(mask & symbol_bit(g._trie.symbol_id('n')))
+        self.assertFalse(mask & symbol_bit(g._trie.symbol_id('a')))
+        end = node
+        for c in 'aturdays':
+            end = g.get_neighbor(c, end)
+        self.assertEqual(g._trie.symbol_mask(end), 0)
+        g.freeze()
+        node = g.get_neighbor('S', INIT_NODE)
+        self.assertEqual(g._trie.length_range(INIT_NODE), (3, 9))
+        self.assertEqual(g._trie.symbol_mask(g.get_neighbor('u', node)), mask)
+        # Linking nodes recalculates the ranges
+        g = TextGraph()
+        g.index(['ab', 'cab'])
+        g.set_neighbor(g.get_neighbor('c', INIT_NODE), g.get_neighbor('a', INIT_NODE), 'a')
+        self.assertEqual(g._trie.length_range(g.get_neighbor('c', INIT_NODE)), (2, 2))
+        g.add('c')
+        self.assertEqual(g._trie.length_range(g.get_neighbor('c', INIT_NODE)), (0, 2))
+        self.assertEqual(g._trie.symbol_mask(g.get_neighbor('c', INIT_NODE)),
+                         symbol_bit(g._trie.symbol_id('a')) | symbol_bit(g._trie.symbol_id('b')))
+
+    def test_encoding(self) -> None:
+        g = TextGraph()
+        g.index(['Saturday', 'Saturdays', 'Sun'])
+        symbols = g.encode('Sunx')
+        self.assertListEqual(symbols[:3], [g._trie.symbol_id(c) for c in 'Sun'])
+        self.assertEqual(symbols[3], -1)
+        self.assertEqual(g.decode(symbols[:3]), 'Sun')
+        # The elements which are not below a node are counted with the symbol summaries
+        encoded = EncodedEntity(g.encode('Sunday'))
+        node = g.get_neighbor('u', g.get_neighbor('S', INIT_NODE))
+        self.assertEqual(encoded.missing(0, g._trie.symbol_mask(node)), 5)
+        self.assertEqual(encoded.missing(2, g._trie.symbol_mask(INIT_NODE)), 0)
+        # The frozen arrays use the smallest integer type
+        g.freeze()
+        self.assertEqual(g._trie.arrays['values'].itemsize, 1)
+        self.assertEqual(g._trie.arrays['children'].itemsize, 4)
+        self.assertEqual(g.decode(g.encode('Sun')), 'Sun')
+
+    def test_bulk_index(self) -> None:
+        lev = WeightedLevenshtein()
+        lev.add_insert_cost(' ', 0.1)
+        entities = ['pointing', 'hello', 'point of sale', '', 'bye', 'goodbye', 'point', 'hello', 'help', 'bye bye']
+        for sample in [entities, sorted(entities), [('a', 1), ('b',), ('a', 'b'), ('a', 1, 2)]]:
+            expected = TextGraph(distance=lev)
+            for entity in sample:
+                expected.add(entity)
+            for processors in [1, 2]:
+                g = TextGraph(distance=lev)
+                g.index(sample, processors)
+                for name in ['_symbols', '_weight_table', '_values', '_weights', '_finals', '_first_child',
+                             '_last_child', '_next_sibling', '_min_lengths', '_max_lengths', '_symbol_masks',
+                             '_children']:
+                    self.assertEqual(getattr(g._trie, name), getattr(expected._trie, name))
+        # A graph that is not empty is extended in the same way
+        g, expected = TextGraph(), TextGraph()
+        g.index(['help', 'hello'], 2)
+        g.index(['hell', 'apple'], 2)
+        expected.index(['help', 'hello', 'hell', 'apple'])
+        self.assertEqual(len(g.nodes), len(expected.nodes))
+        self.assertEqual(str(g.search('hell', nbest=0)), str(expected.search('hell', nbest=0)))
+
+    def test_remove(self) -> None:
+        entities = ['hello', 'help', 'helper', 'bye', 'goodbye', 'point of sale', 'pointing']
+        g = TextGraph()
+        g.index(entities)
+        for entity in ['helper', 'point of sale', 'bye']:
+            g.remove(entity)
+        expected = TextGraph()
+        expected.index(['hello', 'help', 'goodbye', 'pointing'])
+        self.assertEqual(len(g.nodes), len(expected.nodes))
+        for node in [INIT_NODE, g.get_neighbor('h', INIT_NODE)]:
+            self.assertEqual(g._trie.length_range(node), (4, 8) if node == INIT_NODE else (3, 4))
+            self.assertEqual(g._trie.symbol_mask(node) & symbol_bit(g._trie.symbol_id('r')), 0)
+        for term in ['helper', 'point of sale', 'by', 'hello']:
+            self.assertEqual(str(g.search(term, nbest=0)), str(expected.search(term, nbest=0)))
+        with self.assertRaises(KeyError):
+            g.remove('hel')
+        with self.assertRaises(KeyError):
+            g.remove('bye')
+        # The deleted nodes are reused
+        size = len(g._trie)
+        g.add('point of sale')
+        self.assertEqual(len(g._trie), size)
+        self.assertEqual(g.search('point of sale')[0][0], 'point of sale')
+
+    def test_payloads(self) -> None:
+        g = TextGraph()
+        g.index(['hello', 'help', 'bye'], payloads=[1, {'id': 2}, None])
+        g.add('goodbye', 'good')
+        results = g.search('helo', threshold=0.5, nbest=0)
+        self.assertEqual({result[0]: result.payload for result in results}, {'hello': 1, 'help': {'id': 2}})
+        self.assertEqual(g.search('goodbye', engine=ROWS)[0].payload, 'good')
+        self.assertIsNone(g.search('bye')[0].payload)
+        # Adding an entity again without payload keeps it
+        g.add('hello')
+        self.assertEqual(g.search('hello')[0].payload, 1)
+        g.remove('hello')
+        g.add('hello')
+        self.assertIsNone(g.search('hello')[0].payload)
+        with TemporaryDirectory() as tmp:
+            file = path.join(tmp, 'graph.bin')
+            g.save(file)
+            loaded = TextGraph.load(file)
+            self.assertEqual(loaded.search('goodbye')[0].payload, 'good')
+            self.assertEqual(loaded.search('help')[0], ('help', 0.0, loaded.search('help')[0][2]))
+            del loaded
+
+    def test_minimize(self) -> None:
+        entities = ['information', 'formation', 'nation', 'point of sale', 'bill of sale', 'pointing', 'billing']
+        g, minimized = TextGraph(), TextGraph()
+        g.index(entities)
+        minimized.index(entities, payloads=[None, None, None, None, None, None, 'billing'])
+        minimized.freeze(minimize=True)
+        self.assertTrue(minimized.minimized)
+        # The suffix "ing" of "billing" is not merged with the one of "pointing" because it has a payload
+        self.assertEqual(len(g.freeze().nodes), 58)
+        self.assertEqual(len(minimized.nodes), 36)
+        for term in ['formation', 'nations', 'bil of sales', 'pointing']:
+            for kwargs in [{}, {'dominance': True}, {'engine': ROWS}]:
+                self.assertEqual(str(minimized.search(term, nbest=0, **kwargs)), str(g.search(term, nbest=0, **kwargs)))
+        self.assertEqual(minimized.search('billing')[0].payload, 'billing')
+        self.assertIsNone(minimized.search('pointing')[0].payload)
+        with TemporaryDirectory() as tmp:
+            file = path.join(tmp, 'graph.bin')
+            minimized.save(file)
+            loaded = TextGraph.load(file)
+            self.assertTrue(loaded.minimized)
+            self.assertEqual(len(loaded.nodes), len(minimized.nodes))
+            self.assertEqual(str(loaded.search('bil of sales', dominance=True)),
+                             str(g.search('bil of sales', dominance=True)))
+            del loaded
+
+    def test_save_and_load(self) -> None:
+        lev = WeightedLevenshtein()
+        lev.add_insert_cost(' ', 0.1)
+        g = TextGraph(distance=lev)
+        g.index(['hello', 'bye', 'goodbye', 'point of sale', 'pointing'])
+        with TemporaryDirectory() as tmp:
+            file = path.join(tmp, 'graph.bin')
+            g.save(file)
+            self.assertFalse(g.frozen)
+            for mmap in [True, False]:
+                loaded = TextGraph.load(file, mmap=mmap)
+                self.assertIsInstance(loaded, TextGraph)
+                self.assertTrue(loaded.frozen)
+                self.assertEqual(len(loaded.nodes), len(g.nodes))
+                self.assertEqual(loaded.distance.insert_cost(' '), 0.1)
+                for term in ['pointof sales', 'goodby', 'hello']:
+                    self.assertEqual(str(loaded.search(term, nbest=0)), str(g.search(term, nbest=0)))
+                # Save again a loaded graph
+                loaded.save(path.join(tmp, 'graph2.bin'))
+                with open(file, 'rb') as file1, open(path.join(tmp, 'graph2.bin'), 'rb') as file2:
+                    self.assertEqual(file1.read(), file2.read())
+                del loaded
+            with open(file, 'wb') as f:
+                f.write(b'Not a graph' * 10)
+            with self.assertRaises(ValueError):
+                TextGraph.load(file)
+
 
 if __name__ == '__main__':
     unittest.main()
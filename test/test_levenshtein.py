@@ -1,7 +1,16 @@
+import asyncio
 import unittest
+from concurrent.futures import ThreadPoolExecutor
+from time import sleep, monotonic
+from unittest.mock import patch
 
-from grapheditdistance.distances import WeightedLevenshtein
-from grapheditdistance import TextGraph, Graph
+from grapheditdistance.cache import SearchCache
+from grapheditdistance.frontier import BucketFrontier, HeapFrontier
+from grapheditdistance.stats import SearchStats
+from grapheditdistance.distances import WeightedLevenshtein, Levenshtein, DamerauLevenshtein
+from grapheditdistance import TextGraph, Graph, BEST_FIRST, ROWS, AUTOMATON, INIT_NODE, FINAL_NODE
+from grapheditdistance.operators import OperatorChain, InsertOperator, ReplaceOperator, NoneOperator, FinalOperator, \
+    Operator
 
 TERMS = ['hello', 'bye', 'goodbye', 'point of sale', 'pointing']
 
@@ -123,6 +132,32 @@ class MyTestCase(unittest.TestCase):
                '(None), (None), (None), (None), (insert[s], 1), (Final)]'
         self.assertEqual(str(results[0][2]), path)
 
+    def test_damerau_levenshtein(self) -> None:
+        g = TextGraph(distance=DamerauLevenshtein())
+        g.index([t.lower() for t in TERMS])
+        for dominance in [False, True]:
+            results = g.search('poitn fo sael', threshold=0.7, nbest=0, dominance=dominance)
+            self.assertEqual(results[0][0], 'point of sale')
+            self.assertEqual(results[0][1], 3.0)
+            self.assertEqual(str(results[0][2]), '[(None), (None), (None), (transpose[tn -> nt], 1), (None), '
+                                                 '(transpose[fo -> of], 1), (None), (None), (None), '
+                                                 '(transpose[el -> le], 1), (Final)]')
+        # A transposition is cheaper than two operations, and the search explores fewer paths
+        lev = TextGraph()
+        lev.index([t.lower() for t in TERMS])
+        self.assertListEqual(lev.search('poitn fo sael', threshold=0.7), [])
+        self.assertEqual(g.search('hlelo', threshold=0.7, nbest=0)[0][1], 1.0)
+        self.assertEqual(lev.search('hlelo', threshold=0.6, nbest=0)[0][1], 2.0)
+        self.assertLess(g.search('hlelo', threshold=0.7, stats=True).stats.expansions,
+                        lev.search('hlelo', threshold=0.6, stats=True).stats.expansions)
+        # Equal adjacent elements are not transposed, and the costs can be changed
+        self.assertNotIn('transpose', str(g.search('hello', threshold=0.6, nbest=0)))
+        g.distance = DamerauLevenshtein(transpose_cost=2)
+        self.assertEqual(g.search('hlelo', threshold=0.6)[0][1], 2.0)
+        self.assertFalse(DamerauLevenshtein(transpose_cost=0.5).integer_costs)
+        with self.assertRaises(ValueError):
+            g.search('hlelo', engine=ROWS)
+
     def test_entity_levenshtein(self) -> None:
         # I use Graph() instead TextGraph() but with WeightedLevenshtein
         lev = WeightedLevenshtein()
@@ -156,6 +191,418 @@ class MyTestCase(unittest.TestCase):
         self.assertEqual(results[0][1], 0.1)
         self.assertEqual(str(results[0][2]), '[(None), (delete[of], 0.1), (None), (Final)]')
 
+    def test_dominance(self) -> None:
+        g = TextGraph()
+        g.index([t.lower() for t in TERMS])
+        for term in ['poimt of sales', 'point of sale', 'poit of sal', 'punto']:
+            self.assertListEqual(g.search(term, nbest=1, dominance=True), g.search(term, nbest=1))
+        # Only the cheapest way to obtain each entity is kept
+        lev = WeightedLevenshtein()
+        lev.add_insert_cost(' ', 0.1)
+        lev.add_delete_cost(' ', 0.1)
+        lev.add_replace_cost(' ', '-', 0.1)
+        lev.add_replace_cost('-', ' ', 0.1)
+        tree = TextGraph(distance=lev)
+        tree.index([t.lower() for t in TERMS])
+        results = tree.search('Poi ntof-sales'.lower(), nbest=0, dominance=True)
+        self.assertEqual(len(results), 2)
+        self.assertEqual(results[0][0], 'point of sale')
+        self.assertEqual(results[0][1], 1.3)
+        self.assertEqual(results[1][1], 2.3)
+
+    def test_heuristic(self) -> None:
+        g = TextGraph()
+        g.index([t.lower() for t in TERMS])
+        for term in ['poimt of sales', 'point of sale', 'poit of sal', 'punto', 'bye', 'godbye']:
+            self.assertEqual(sorted(map(str, g.search(term, nbest=0, heuristic=True))),
+                             sorted(map(str, g.search(term, nbest=0))))
+            self.assertEqual(g.search(term, heuristic=True)[:1], g.search(term, engine=ROWS)[:1])
+        lev = WeightedLevenshtein()
+        lev.add_insert_cost(' ', 0.1)
+        lev.add_delete_cost('-', 0.2)
+        lev.add_replace_cost('-', ' ', 0.3)
+        self.assertEqual((lev.min_insert_cost, lev.min_delete_cost, lev.min_replace_cost), (0.1, 0.2, 0.3))
+        # The bounds of a subclass that overrides the cost methods are unknown, then, nothing is pruned with them
+        class CheapInsertion(Levenshtein):
+            def insert_cost(self, element: str) -> float:
+                return 0.2
+
+        self.assertEqual((CheapInsertion().min_insert_cost, CheapInsertion().min_delete_cost), (0, 1))
+        g = TextGraph(distance=CheapInsertion())
+        g.index(['ab', 'bye'])
+        for heuristic in [False, True]:
+            results = g.search('a    b', threshold=0.8, nbest=0, heuristic=heuristic)
+            self.assertEqual([result[:2] for result in results], [('ab', 0.8)])
+            self.assertEqual(str(results), str(g.search('a    b', threshold=0.8, nbest=0, engine=ROWS)))
+        # Also if the subclass creates cheaper operators in costs()
+        class CheapInsertOperators(Levenshtein):
+            def costs(self, pos, entity, graph, curr_node, next_node, operators):
+                return [InsertOperator(0.5, op.inserted_element, op.next_node) if isinstance(op, InsertOperator)
+                        else op for op in super().costs(pos, entity, graph, curr_node, next_node, operators)]
+
+        self.assertEqual((CheapInsertOperators().min_insert_cost, CheapInsertOperators().min_delete_cost), (0, 0))
+        self.assertEqual((DamerauLevenshtein().min_insert_cost, DamerauLevenshtein().min_delete_cost), (1, 1))
+        g = TextGraph(distance=CheapInsertOperators())
+        g.index(['ab', 'abc', 'bye', 'xb', 'axb', 'b'])
+        for heuristic in [False, True]:
+            best = {}
+            for entity, value, _ in g.search('axxb', threshold=0.5, nbest=0, heuristic=heuristic):
+                best[entity] = min(best.get(entity, value), value)
+            self.assertDictEqual(best, {'ab': 1, 'abc': 2, 'axb': 0.5, 'b': 1.5, 'xb': 1})
+        class CheapReplacement(Levenshtein):
+            def replace_cost(self, fr: str, to: str) -> float:
+                return 0.1
+
+        self.assertEqual(CheapReplacement().min_replace_cost, 0)
+        g = TextGraph(distance=CheapReplacement())
+        g.index(['xyz', 'bye'])
+        self.assertEqual(sorted(str(result) for result in g.search('abc', threshold=0.8, nbest=0)),
+                         sorted(str(result) for result in g.search('abc', threshold=0.8, nbest=0, engine=ROWS)))
+        self.assertEqual(len(g.search('abc', threshold=0.8, nbest=0)), 2)
+
+        class CheapReplaceOperators(Levenshtein):
+            def costs(self, pos, entity, graph, curr_node, next_node, operators):
+                return [ReplaceOperator(0.1, op.from_element, op.to_element, op.next_node)
+                        if isinstance(op, ReplaceOperator) else op
+                        for op in super().costs(pos, entity, graph, curr_node, next_node, operators)]
+
+        self.assertEqual(CheapReplaceOperators().min_replace_cost, 0)
+        self.assertEqual(DamerauLevenshtein().min_replace_cost, 1)
+        g = TextGraph(distance=CheapReplaceOperators())
+        g.index(['xyz', 'bye'])
+        results = g.search('abc', threshold=0.8, nbest=0)
+        self.assertListEqual(sorted({entity for entity, value, _ in results if value < 0.31}), ['bye', 'xyz'])
+
+    def test_top_k(self) -> None:
+        class PenaltyOperator(FinalOperator):
+            def __init__(self) -> None:
+                Operator.__init__(self, 'Final', 1.5, 0, FINAL_NODE)
+
+        class FinalPenalty(Levenshtein):
+            """ Penalize the entities that end with "b". """
+            def costs(self, pos, entity, graph, curr_node, next_node, operators):
+                return [PenaltyOperator() if isinstance(op, FinalOperator) and
+                        graph.value(curr_node) == 'b' else op
+                        for op in super().costs(pos, entity, graph, curr_node, next_node, operators)]
+
+        self.assertFalse(FinalPenalty().integer_costs)
+        g = TextGraph(distance=FinalPenalty())
+        g.index(['ab', 'abd', 'abde'])
+        # "ab" is found before "abd", but it is more expensive
+        self.assertEqual([(r[0], r[1]) for r in g.search('ab', threshold=0, nbest=1)], [('abd', 1)])
+        self.assertEqual([(r[0], r[1]) for r in g.search('ab', threshold=0, nbest=2)], [('abd', 1), ('ab', 1.5)])
+        results = g.search('ab', threshold=0, nbest=0)
+        self.assertListEqual([r[1] for r in results], sorted(r[1] for r in results))
+
+    def test_iter_search(self) -> None:
+        g = TextGraph()
+        g.index([t.lower() for t in TERMS])
+        for term in ['poimt of sales', 'poit of sal', 'bye', 'godbye']:
+            self.assertListEqual(list(g.iter_search(term, nbest=0)), g.search(term, nbest=0))
+            self.assertListEqual(list(g.iter_search(term, nbest=1)), g.search(term, nbest=1))
+        results = g.iter_search('godbye', threshold=0.5)
+        self.assertEqual(next(results)[0], 'goodbye')
+        results.close()
+
+    def test_search_async(self) -> None:
+        g = TextGraph(cache_size=10)
+        g.index([t.lower() for t in TERMS])
+
+        async def search(**kwargs):
+            return await g.search_async('poimt of sales', nbest=0, yield_every=1, **kwargs)
+
+        expected = g.search('poimt of sales', nbest=0)
+        g.cache.clear()
+        self.assertListEqual(asyncio.run(search()), expected)
+        with ThreadPoolExecutor(2) as executor:
+            self.assertListEqual(asyncio.run(search(executor=executor, engine=ROWS)),
+                                 g.search('poimt of sales', nbest=0, engine=ROWS))
+            self.assertListEqual(asyncio.run(search(executor=executor, dominance=True)),
+                                 g.search('poimt of sales', nbest=0, dominance=True))
+        with self.assertRaises(asyncio.TimeoutError):
+            asyncio.run(search(timeout=0, dominance=True, heuristic=True))
+
+        async def cancel():
+            task = asyncio.create_task(search(heuristic=True))
+            await asyncio.sleep(0)
+            task.cancel()
+            await task
+
+        with self.assertRaises(asyncio.CancelledError):
+            asyncio.run(cancel())
+
+    def test_budgets(self) -> None:
+        g = TextGraph(cache_size=10)
+        g.index([t.lower() for t in TERMS])
+        results = g.search('poimt of sales', nbest=0)
+        self.assertTrue(results.complete)
+        results = g.search('poit of sal', nbest=0, max_expansions=5)
+        self.assertFalse(results.complete)
+        self.assertEqual(len(g.cache), 1)
+        results = g.search('poit of sal', nbest=0, deadline=monotonic())
+        self.assertListEqual(results, [])
+        self.assertFalse(results.complete)
+        # With enough budget, the results are the same
+        results = g.search('poit of sal', nbest=0, max_expansions=100000, deadline=monotonic() + 60)
+        self.assertTrue(results.complete)
+        self.assertListEqual(results, g.search('poit of sal', nbest=0))
+        with self.assertRaises(ValueError):
+            g.search('poit of sal', engine=ROWS, max_expansions=5)
+
+    def test_search_stats(self) -> None:
+        g = TextGraph(cache_size=10)
+        g.index([t.lower() for t in TERMS])
+        results = g.search('poimt of sales', nbest=0)
+        self.assertIsNone(results.stats)
+        g.cache.clear()
+        for dominance in [False, True]:
+            stats = g.search('poimt of sales', nbest=0, dominance=dominance, stats=True).stats
+            self.assertFalse(stats.cached)
+            self.assertGreater(stats.expansions, 0)
+            self.assertGreaterEqual(stats.candidates, stats.expansions)
+            self.assertGreater(stats.pruned_by_threshold, 0)
+            self.assertGreater(stats.pruned_by_visited, 0)
+            self.assertGreater(stats.peak_frontier, 0)
+            self.assertGreater(stats.total_seconds, stats.costs_seconds + stats.frontier_seconds)
+        self.assertEqual(stats.results, len(g.search('poimt of sales', nbest=0, dominance=True)))
+        # The hooks receive the statistics of every search, including the cached ones
+        calls = []
+
+        def hook(entity: str, search_stats: SearchStats) -> None:
+            calls.append((entity, search_stats.engine, search_stats.cached))
+
+        g.add_search_hook(hook)
+        results = g.search('poimt of sales', nbest=0, engine=ROWS)
+        self.assertGreater(results.stats.expansions, 0)
+        g.search('poimt of sales', nbest=0, engine=ROWS)
+        self.assertListEqual(calls, [('poimt of sales', ROWS, False), ('poimt of sales', ROWS, True)])
+        # Also the asynchronous ones, in the event loop or in an executor
+        results = asyncio.run(g.search_async('poit of sal', nbest=0, yield_every=1))
+        self.assertGreater(results.stats.expansions, 0)
+        self.assertEqual(results.stats.results, len(results))
+        with ThreadPoolExecutor(1) as executor:
+            stats = asyncio.run(g.search_async('bye', nbest=0, engine=AUTOMATON, executor=executor)).stats
+        self.assertGreater(stats.expansions, 0)
+        asyncio.run(g.search_async('poit of sal', nbest=0))
+        self.assertListEqual(calls[2:], [('poit of sal', BEST_FIRST, False), ('bye', AUTOMATON, False),
+                                         ('poit of sal', BEST_FIRST, True)])
+        g.remove_search_hook(hook)
+        g.search('poit of sal')
+        self.assertIsNone(asyncio.run(g.search_async('poit of sal')).stats)
+        self.assertEqual(len(calls), 5)
+
+    def test_frontier(self) -> None:
+        for frontier in [BucketFrontier(), HeapFrontier()]:
+            for key, value in [(2., 'a'), (1, 'b'), (2, 'c'), (0, 'd'), (1, 'e')]:
+                frontier.push(key, value)
+            self.assertEqual(len(frontier), 5)
+            self.assertListEqual([frontier.pop()[1] for _ in range(5)], ['d', 'e', 'b', 'c', 'a'])
+            with self.assertRaises(IndexError):
+                frontier.pop()
+        with self.assertRaises(ValueError):
+            BucketFrontier().push(0.5, 'a')
+        lev = WeightedLevenshtein()
+        self.assertTrue(lev.integer_costs)
+        lev.add_insert_cost(' ', 0.1)
+        self.assertFalse(lev.integer_costs)
+        # The costs of a subclass that overrides the cost methods are unknown
+        class HalfInsertion(Levenshtein):
+            def insert_cost(self, element: str) -> float:
+                return 0.5
+
+        self.assertTrue(DamerauLevenshtein().integer_costs)
+        self.assertFalse(HalfInsertion().integer_costs)
+        g = TextGraph(distance=HalfInsertion())
+        g.index(['ab', 'bye'])
+        self.assertEqual(g.search('abc', threshold=0.5)[0][:2], ('ab', 0.5))
+
+    def test_rows_engine(self) -> None:
+        g = TextGraph()
+        g.index([t.lower() for t in TERMS])
+        for term in ['poimt of sales', 'point of sale', 'poit of sal', 'punto', 'goodbye']:
+            self.assertListEqual([(r[0], r[1], str(r[2])) for r in g.search(term, nbest=0, engine=ROWS)],
+                                 [(r[0], r[1], str(r[2])) for r in g.search(term, nbest=0, dominance=True)])
+        # With a weighted Levenshtein only the best list of operators is returned
+        lev = WeightedLevenshtein()
+        lev.add_insert_cost(' ', 0.1)
+        lev.add_delete_cost(' ', 0.1)
+        lev.add_replace_cost(' ', '-', 0.1)
+        lev.add_replace_cost('-', ' ', 0.1)
+        tree = TextGraph(distance=lev)
+        tree.index([t.lower() for t in TERMS])
+        results = tree.search('Poi ntof-sales'.lower(), nbest=0, engine=ROWS)
+        self.assertEqual(len(results), 1)
+        path = '[(None), (None), (None), (insert[ ], 0.1), (None), (None), (delete[ ], 0.1), (None), (None), ' \
+               '(replace[- ->  ], 0.1), (None), (None), (None), (None), (insert[s], 1), (Final)]'
+        self.assertEqual(results[0][0], 'point of sale')
+        self.assertEqual(results[0][1], 1.3)
+        self.assertEqual(str(results[0][2]), path)
+        # Word level
+        lev = WeightedLevenshtein()
+        lev.add_delete_cost('of', 0.1)
+        g = Graph(distance=lev)
+        g.add(['point', 'of', 'sales'])
+        g.add(['pointing'])
+        self.assertListEqual(g.search(['point', 'sales'], engine=ROWS)[0][0], ['point', 'of', 'sales'])
+        with self.assertRaises(ValueError):
+            g.search(['point', 'sales'], engine='unknown')
+
+    def test_automaton_engine(self) -> None:
+        graphs = [TextGraph(), TextGraph(), TextGraph(distance=Levenshtein(0.5, 0.5, 0.5))]
+        for g in graphs:
+            g.index([t.lower() for t in TERMS] + ['help', 'hell', 'pointed', 'bey'])
+            g.add('hall', payload=1)
+        graphs[1].freeze(minimize=True)
+        for g in graphs:
+            for term in ['poimt of sales', 'point of sale', 'poit of sal', 'punto', 'goodbye', 'helo', 'hlel', 'b', '']:
+                for threshold in [0.9, 0.8, 0.6]:
+                    for nbest in [1, 3, 0]:
+                        expected = g.search(term, threshold, nbest, engine=ROWS)
+                        results = g.search(term, threshold, nbest, engine=AUTOMATON)
+                        self.assertListEqual([(r[0], r[1], str(r[2]), r.payload) for r in results],
+                                             [(r[0], r[1], str(r[2]), r.payload) for r in expected])
+        g = graphs[0]
+        self.assertEqual(g.search('hal', 0.6, engine=AUTOMATON)[0].payload, 1)
+        # The walk is pruned when the edit budget is exceeded
+        stats = g.search('poimt of sales', stats=True, engine=AUTOMATON).stats
+        self.assertLess(stats.expansions, len(g.nodes))
+        self.assertGreater(stats.pruned_by_threshold, 0)
+        # It needs a plain Levenshtein distance with the same costs
+        for distance in [Levenshtein(1, 1, 2), WeightedLevenshtein(), DamerauLevenshtein()]:
+            with self.assertRaises(ValueError):
+                TextGraph(distance=distance).search('helo', engine=AUTOMATON)
+        with self.assertRaises(ValueError):
+            g.search('helo', engine=AUTOMATON, max_expansions=10)
+
+    def test_frozen_graph(self) -> None:
+        lev = WeightedLevenshtein()
+        lev.add_insert_cost(' ', 0.1)
+        lev.add_delete_cost(' ', 0.1)
+        g = TextGraph(distance=lev)
+        g.index([t.lower() for t in TERMS])
+        frozen = TextGraph(distance=lev)
+        frozen.index([t.lower() for t in TERMS])
+        self.assertIs(frozen.freeze(), frozen)
+        self.assertTrue(frozen.frozen)
+        self.assertFalse(g.frozen)
+        self.assertEqual(len(frozen.nodes), len(g.nodes))
+        for term in ['poi ntof-sales', 'poimt of sales', 'pointin', 'goodby']:
+            self.assertEqual(str(frozen.search(term, nbest=0)), str(g.search(term, nbest=0)))
+            self.assertEqual(str(frozen.search(term, nbest=0, engine=ROWS)), str(g.search(term, nbest=0, engine=ROWS)))
+        with self.assertRaises(RuntimeError):
+            frozen.add('point of sales')
+
+    def test_search_many(self) -> None:
+        g = TextGraph(processors=2)
+        g.index([t.lower() for t in TERMS])
+        terms = ['poimt of sales', 'point of sale', 'poit of sal', 'punto', 'goodby', 'helo', 'by']
+        results = g.search_many(terms, nbest=0)
+        self.assertEqual(len(results), len(terms))
+        for term, result in zip(terms, results):
+            self.assertEqual(str(result), str(g.search(term, nbest=0)))
+        results = g.search_many(terms, threshold=0.5, engine=ROWS, processors=1)
+        for term, result in zip(terms, results):
+            self.assertEqual(str(result), str(g.search(term, threshold=0.5, engine=ROWS)))
+
+    def test_search_batch(self) -> None:
+        lev = WeightedLevenshtein()
+        lev.add_insert_cost(' ', 0.1)
+        lev.add_delete_cost(' ', 0.1)
+        lev.add_replace_cost('-', ' ', 0.1)
+        g = TextGraph(distance=lev)
+        g.index([t.lower() for t in TERMS] + ['point', 'points of sale'])
+        terms = ['point of sale', 'point of sales', 'point-of-sale', 'poimt', 'goodby', 'point of sale', '', 'bye']
+        # The rows of big entity tries are calculated with NumPy
+        for vector_size in [512, 0]:
+            with patch('grapheditdistance.rows.VECTOR_SIZE', vector_size):
+                for nbest in [0, 1, 2]:
+                    results = g.search_batch(terms, threshold=0.7, nbest=nbest)
+                    self.assertEqual(len(results), len(terms))
+                    for term, result in zip(terms, results):
+                        self.assertEqual(str(result), str(g.search(term, threshold=0.7, nbest=nbest, engine=ROWS)))
+            self.assertEqual(results[2][0][0], 'point of sale')
+            self.assertEqual(results[2][0][1], 0.2)
+
+    def test_cost_tables(self) -> None:
+        lev = WeightedLevenshtein(1, 0.9, 0.8)
+        lev.add_insert_cost(' ', 0.1)
+        lev.add_replace_cost('-', ' ', 0.3)
+        tables = lev.cost_tables()
+        self.assertIs(lev.cost_tables(), tables)
+        self.assertEqual(list(tables.insert_costs[tables.encode([' ', '-', 'a'])]), [0.1, 1, 1])
+        self.assertEqual(tables.replace_costs[tables.code('-'), tables.code(' ')], 0.3)
+        self.assertEqual(tables.replace_costs[tables.code(' '), tables.code('-')], 0.8)
+        lev.add_delete_cost('a', 0.5)
+        self.assertEqual(lev.cost_tables().delete_costs[lev.cost_tables().code('a')], 0.5)
+        self.assertEqual(list(Levenshtein(2, 3, 4).cost_tables().replace_costs.ravel()), [4])
+
+    def test_cache(self) -> None:
+        lev = WeightedLevenshtein()
+        g = TextGraph(distance=lev, cache_size=2)
+        g.index([t.lower() for t in TERMS])
+        results = g.search('poimt of sales', nbest=0)
+        self.assertEqual((g.cache.hits, g.cache.misses), (0, 1))
+        self.assertEqual(str(g.search('poimt of sales', nbest=0)), str(results))
+        self.assertEqual((g.cache.hits, g.cache.misses), (1, 1))
+        # Different parameters or distance configurations are different keys
+        g.search('poimt of sales', nbest=1)
+        lev.add_insert_cost('s', 0.1)
+        self.assertEqual(g.search('poimt of sales', nbest=0)[0][1], 1.1)
+        self.assertEqual((g.cache.hits, g.cache.misses), (1, 3))
+        self.assertEqual(len(g.cache), 2)
+        # Adding entities invalidates the cache
+        g.add('poimt of sales')
+        self.assertEqual(len(g.cache), 0)
+        self.assertEqual(g.search('poimt of sales', nbest=1)[0][1], 0)
+        # And also linking nodes
+        g = TextGraph(cache_size=2)
+        g.index(['ab', 'c'])
+        self.assertEqual(g.search('cab', threshold=0.5)[0][:2], ('ab', 1))
+        g.set_neighbor(g.get_neighbor('c', INIT_NODE), g.get_neighbor('a', INIT_NODE), 'a')
+        self.assertEqual(len(g.cache), 0)
+        self.assertEqual(g.search('cab', threshold=0.5)[0][:2], ('cab', 0))
+        self.assertIsNone(TextGraph().cache)
+
+    def test_search_cache(self) -> None:
+        cache = SearchCache(2)
+        cache.put('a', 1)
+        cache.put('b', 2)
+        self.assertEqual(cache.get('a'), 1)
+        cache.put('c', 3)
+        # The least recently used one was "b"
+        self.assertIsNone(cache.get('b'))
+        self.assertEqual(cache.get('c'), 3)
+        self.assertEqual((cache.hits, cache.misses), (2, 1))
+        cache = SearchCache(2, ttl=0.05)
+        cache.put('a', 1)
+        self.assertEqual(cache.get('a'), 1)
+        sleep(0.1)
+        self.assertEqual(cache.get('a', 0), 0)
+        self.assertEqual(len(cache), 0)
+        with self.assertRaises(ValueError):
+            SearchCache(0)
+
+    def test_operator_chain(self) -> None:
+        self.assertEqual(InsertOperator(1, 'a', 3), InsertOperator(1, 'a', 3))
+        self.assertEqual(hash(InsertOperator(1, 'a', 3)), hash(InsertOperator(1, 'a', 3)))
+        self.assertNotEqual(InsertOperator(1, 'a', 3), InsertOperator(1, 'b', 3))
+        with self.assertRaises(AttributeError):
+            FinalOperator().value = 1
+        empty = OperatorChain()
+        chain = empty.append(NoneOperator('h', 1)).append(InsertOperator(1, 'o', 1))
+        other = chain.append(FinalOperator())
+        self.assertEqual((len(empty), len(chain), len(other)), (0, 2, 3))
+        self.assertEqual(chain.to_list(), [NoneOperator('h', 1), InsertOperator(1, 'o', 1)])
+        self.assertEqual(other[-1], FinalOperator())
+        self.assertEqual(chain.path(), ['h'])
+        self.assertEqual(chain, empty.append(NoneOperator('h', 1)).append(InsertOperator(1, 'o', 1)))
+        self.assertEqual(hash(chain), hash(empty.append(NoneOperator('h', 1)).append(InsertOperator(1, 'o', 1))))
+        self.assertNotEqual(chain, other)
+        # The search results have lists of operators
+        g = TextGraph()
+        g.index(TERMS)
+        self.assertIsInstance(g.search('hello')[0][2], list)
+
 
 if __name__ == '__main__':
     unittest.main()